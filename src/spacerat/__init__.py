@@ -1 +1,15 @@
-from .core import SpaceRAT
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .core import SpaceRAT
+
+__all__ = ["SpaceRAT"]
+
+
+def __getattr__(name: str):
+    # imported on first use, so light entry points like the CLI's help skip the model and database stack
+    if name == "SpaceRAT":
+        from .core import SpaceRAT
+
+        return SpaceRAT
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,6 +1,6 @@
 import os
 
-from flask import Flask, request, abort
+from flask import Flask, request, abort, current_app
 
 from spacerat.core import QuestionParam, RegionParam, SpaceRAT
 from spacerat.helpers import by_region
@@ -12,11 +12,21 @@ app.config["SQLALCHEMY_DATABASE_URI"] = os.environ.get("SPACERAT_DB_URL")
 app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
 app.config['APPLICATION_ROOT'] = os.environ.get("APPLICATION_ROOT")
 
+# shared by all requests so model lookups, query templates and connection pools are reused
+app.extensions["spacerat"] = SpaceRAT()
+# the model doesn't change after init, so listings are serialized once per model type
+app.extensions["spacerat_listings"] = {}
+
+
+def get_rat() -> SpaceRAT:
+    return current_app.extensions["spacerat"]
+
 
 def parse_param(param: str) -> str or list[str]:
-    if "," in param:
-        return param.split(",")
-    return param
+    # most params are a single value, which is returned as-is without splitting
+    if "," not in param:
+        return param
+    return param.split(",")
 
 
 def parse_bool(param: str) -> bool:
@@ -40,8 +50,11 @@ def answer():
 
     geom: bool = parse_bool(request.args.get("geom", "false"))
 
-    # Instantiate spacerat
-    rat = SpaceRAT()
+    stats: frozenset[str] | None = (
+        frozenset(request.args["stats"].split(",")) if "stats" in request.args else None
+    )
+
+    rat = get_rat()
 
     # answer questions
     aggregate_stats, records = rat.answer_question(
@@ -53,6 +66,7 @@ def answer():
         aggregate=aggregate,
         query_records=query_records,
         geom="geojson" if geom else None,
+        stats=stats,
     )
 
     response = {
@@ -66,7 +80,7 @@ def answer():
 
 
 def _show_model(model_type: str, model_id: str):
-    rat = SpaceRAT()
+    rat = get_rat()
     if model_id:
         getter = getattr(rat, f"get_{model_type}")
         obj = getter(model_id)
@@ -77,11 +91,14 @@ def _show_model(model_type: str, model_id: str):
         else:
             abort(404, f"{model_type.capitalize()} not found")
     else:
-        getter = getattr(rat, f"get_{model_type}s")
-        objs = getter()
-        return {
-            "results": [obj.as_brief() for obj in objs],
-        }
+        listings = current_app.extensions["spacerat_listings"]
+        if model_type not in listings:
+            getter = getattr(rat, f"get_{model_type}s")
+            objs = getter(brief=True)
+            listings[model_type] = {
+                "results": [obj.as_brief() for obj in objs],
+            }
+        return listings[model_type]
 
 
 @app.route("/source/", defaults={"source_id": None})
@@ -121,7 +138,7 @@ def get_breaks():
     except KeyError:
         abort(400, "mapset, geog, question, and stat parameters are required.")
 
-    rat = SpaceRAT()
+    rat = get_rat()
 
     return {
         "results": rat.calculate_breaks(
@@ -1,31 +1,51 @@
+import importlib
+import logging
+import os
+import sys
 from os import PathLike
-from pathlib import Path
+from time import perf_counter
+from typing import TYPE_CHECKING
 
 import click
 
-from spacerat import SpaceRAT
-from spacerat.config import init_db
-from spacerat.scripts.generate_questions import generate_questions_for_source
+if TYPE_CHECKING:
+    from spacerat import SpaceRAT
+
+
+# styles are skipped when output is piped or the user opts out (https://no-color.org)
+_COLOR = sys.stdout.isatty() and not os.environ.get("NO_COLOR")
+
+
+def _style(text: str, **styles) -> str:
+    return click.style(text, **styles) if _COLOR else text
 
 
 def _highlight(text: str, **override) -> str:
-    return click.style(text, fg="bright_blue", **override)
+    return _style(text, fg="bright_blue", **override)
 
 
 def _dimmed(text: str, **override) -> str:
-    return click.style(text, fg="bright_black", **override)
+    return _style(text, fg="bright_black", **override)
 
 
 def _bold(text: str, **override) -> str:
-    return click.style(text, bold=True, **override)
+    return _style(text, bold=True, **override)
 
 
 def _italic(text: str, **override) -> str:
-    return click.style(text, italic=True, **override)
+    return _style(text, italic=True, **override)
+
+
+def _done(started: float) -> str:
+    """Marks a step as done with the time taken since `started`, a `perf_counter()` reading."""
+    return _bold("Done!") + _dimmed(f" ({perf_counter() - started:.2f}s)")
 
 
 def _spacerat():
     text = "SpaceRAT"
+    if not _COLOR:
+        return text
+
     colors = [
         (253, 231, 37),
         (189, 223, 38),
@@ -36,13 +56,10 @@ def _spacerat():
         (42, 120, 142),
         (53, 95, 141),
     ]
-    result = ""
-
-    for i, char in enumerate(text):
-        result += click.style(
-            char, fg=colors[i % len(colors)], bold=True, underline=True
-        )
-    return result
+    return "".join(
+        click.style(char, fg=colors[i % len(colors)], bold=True, underline=True)
+        for i, char in enumerate(text)
+    )
 
 
 def write_or_print(text: str, filename: PathLike = None) -> None:
@@ -58,10 +75,10 @@ def abort_if_false(ctx, param, value):
         ctx.abort()
 
 
-def validate_write_setup(rat: SpaceRAT) -> bool:
+def validate_write_setup(rat: "SpaceRAT") -> bool:
     if not rat.source_write_url:
         click.echo(
-            click.style(
+            _style(
                 "⚠️ No changes made. Write access to source database required for geographic database commands.",
                 fg="yellow",
             )
@@ -71,7 +88,54 @@ def validate_write_setup(rat: SpaceRAT) -> bool:
     return True
 
 
-@click.group()
+class LazyGroup(click.Group):
+    """
+    Group that imports its subcommands on first use.
+
+    Each subcommand lives in its own module under `spacerat.cli_cmds`, so listing commands, showing help or completing
+    a command name doesn't import the model and database stack.
+    """
+
+    def __init__(
+        self, *args, lazy_subcommands: dict[str, tuple[str, str]] = None, **kwargs
+    ):
+        super().__init__(*args, **kwargs)
+        # command name -> (module, command attribute)
+        self.lazy_subcommands = lazy_subcommands or {}
+
+    def list_commands(self, ctx: click.Context) -> list[str]:
+        return sorted({*super().list_commands(ctx), *self.lazy_subcommands})
+
+    def get_command(self, ctx: click.Context, cmd_name: str) -> click.Command | None:
+        if cmd_name not in self.commands and cmd_name in self.lazy_subcommands:
+            module_name, attr = self.lazy_subcommands[cmd_name]
+            self.commands[cmd_name] = getattr(
+                importlib.import_module(module_name), attr
+            )
+        return super().get_command(ctx, cmd_name)
+
+
+_COMMANDS = [
+    "generate_questions",
+    "load_model",
+    "dump_model",
+    "build_geo_indices",
+    "link_geogs",
+    "update_maps",
+    "populate_maps",
+    "build_rollups",
+    "build_source_indexes",
+    "init",
+]
+
+
+@click.group(
+    cls=LazyGroup,
+    lazy_subcommands={
+        name.replace("_", "-"): (f"spacerat.cli_cmds.{name}", name)
+        for name in _COMMANDS
+    },
+)
 @click.option(
     "-d",
     "--db",
@@ -126,237 +190,27 @@ def cli(
     click.echo(_spacerat())
     click.echo(_italic("Spatial-Relation Aggregation Toolkit\n"))
 
-    rat = SpaceRAT(**{k: v for k, v in args.items() if v is not None}, debug=debug)
-
     if debug:
-        click.echo(_bold("Running with the following settings"))
-        for k in args.keys():
-            click.echo("  " + _bold(k + ": ") + _dimmed(f"{getattr(rat, k)}"))
+        logging.basicConfig()
+        logging.getLogger("spacerat").setLevel(logging.DEBUG)
 
-    ctx.obj["rat"] = rat
+    # created when a command first needs it, so help and argument errors don't set up databases
+    ctx.obj["rat_args"] = args
+    ctx.obj["debug"] = debug
 
 
-@cli.command()
-@click.argument("source_id")
-@click.pass_context
-def generate_questions(ctx: click.Context, source_id: str):
-    """
-    Generate set of basic Questions from a table in the source database.
-
-    This will generate one Question per column of the table and dump yaml representations of them in the model directory.
-    """
-    rat: SpaceRAT = ctx.obj["rat"]
-    source = rat.get_source(source_id)
-
-    click.echo(f"Dumping question files to {rat.model_dir}/{source.id}")
-
-    generated = generate_questions_for_source(source, rat)
-
-    click.echo(_highlight(str(generated)) + " question files generated")
-    click.echo(_bold("\nDone!", fg="green"))
-
-
-@cli.command()
-@click.argument("src", required=False)
-@click.option("--replace", "-r", is_flag=True, default=False)
-@click.pass_context
-def load_model(ctx: click.Context, src: PathLike, replace: bool):
-    """
-    Load model data from files in `SRC` into database.
-
-    Will overwrite conflicting data.
-    """
-    rat: SpaceRAT = ctx.obj["rat"]
-    init_db(rat.engine, src or rat.model_dir, drop=replace)
-    click.echo(_bold("\nDone!", fg="green"))
-
-
-@cli.command()
-@click.argument("dst", type=click.Path(exists=True), required=False)
-@click.pass_context
-def dump_model(ctx: click.Context, dst: PathLike):
-    """
-    Dump state of model to yaml files in DST.
-
-    It will add directories if needed and will overwrite conflicting files.
-    """
-    rat: SpaceRAT = ctx.obj["rat"]
-    dst = Path(dst) if dst else None
-
-    if dst:
-        (dst / "geographies").mkdir(exist_ok=True)
-        (dst / "sources").mkdir(exist_ok=True)
-        (dst / "questions").mkdir(exist_ok=True)
-
-    click.echo(_bold("Dumping geographies", fg="blue"))
-    for geog in rat.get_geogs():
-        write_or_print(
-            geog.as_yaml(), dst / "geographies" / f"{geog.id}.yaml" if dst else None
-        )
-
-    click.echo(_bold("Dumping sources", fg="blue"))
-    for source in rat.get_sources():
-        write_or_print(
-            source.as_yaml(), dst / "sources" / f"{source.id}.yaml" if dst else None
-        )
-
-    click.echo(_bold("Dumping questions", fg="blue"))
-    for question in rat.get_questions():
-        out_dir = None
-        if dst:
-            out_dir = dst / "questions" / question.source.id
-            out_dir.mkdir(parents=True, exist_ok=True)
-
-        write_or_print(
-            question.as_yaml(), out_dir / f"{question.id}.yaml" if out_dir else None
-        )
+def get_rat(ctx: click.Context) -> "SpaceRAT":
+    """Returns the SpaceRAT for this invocation, creating it on first use."""
+    if "rat" not in ctx.obj:
+        from spacerat import SpaceRAT
 
-    click.echo(_bold("\nDone!", fg="green"))
+        args, debug = ctx.obj["rat_args"], ctx.obj["debug"]
+        rat = SpaceRAT(**{k: v for k, v in args.items() if v is not None}, debug=debug)
 
+        if debug:
+            click.echo(_bold("Running with the following settings"))
+            for k, v in rat.settings.items():
+                click.echo("  " + _bold(k + ": ") + _dimmed(f"{v}"))
 
-@cli.command()
-@click.argument("geog_levels", nargs=-1)
-@click.option(
-    "--yes",
-    is_flag=True,
-    callback=abort_if_false,
-    expose_value=False,
-    prompt="Drop and rebuild geographic index tables?",
-)
-@click.pass_context
-def build_geo_indices(ctx: click.Context, geog_levels: tuple[str]):
-    """Create/update materialized views for geographic indices using `Geography.query`."""
-    rat: SpaceRAT = ctx.obj["rat"]
-
-    if validate_write_setup(rat):
-        for geog_level in geog_levels:
-            click.echo(
-                "Creating index table for " + _highlight(geog_level) + "...  ",
-                nl=False,
-            )
-            rat.create_geog_index(geog_level)
-            click.echo(_bold("Done!"))
-        click.echo(_bold("Done!", fg="green"))
-
-
-@cli.command()
-@click.pass_context
-def link_geogs(ctx: click.Context):
-    rat: SpaceRAT = ctx.obj["rat"]
-    click.echo("Creating geography linking tables")
-    rat.create_geog_association_tables()
-    click.echo(_bold("Done!", fg="green"))
-
-
-@cli.command()
-@click.argument("map_id", nargs=1)
-@click.option(
-    "--replace",
-    "-r",
-    is_flag=True,
-    show_default=True,
-    default=True,
-    help="Overwrite tables if necessary.",
-)
-@click.option(
-    "--yes",
-    is_flag=True,
-    callback=abort_if_false,
-    expose_value=False,
-    prompt="Drop and rebuild map tables?",
-)
-@click.pass_context
-def update_maps(ctx: click.Context, map_id: str, replace):
-    """Loads/updates maps for a MapConfig"""
-    rat: SpaceRAT = ctx.obj["rat"]
-    map_config = rat.get_map_config(map_id)
-    click.echo("Creating maps using config: " + _highlight(map_config.name))
-
-    if validate_write_setup(rat):
-        rat.update_maps(map_id, replace=replace)
-
-    click.echo(_bold("Done!", fg="green"))
-
-
-@cli.command()
-@click.argument("source_id", nargs=1)
-@click.argument("geog_levels", nargs=-1)
-@click.option("--include", "-i", help="Include a field", multiple=True)
-@click.option("--exclude", "-x", help="Exclude a field", multiple=True)
-@click.option(
-    "--replace",
-    "-r",
-    is_flag=True,
-    show_default=True,
-    default=True,
-    help="Overwrite tables if necessary.",
-)
-@click.option(
-    "--yes",
-    is_flag=True,
-    callback=abort_if_false,
-    expose_value=False,
-    prompt="Drop and rebuild map tables?",
-)
-@click.pass_context
-def populate_maps(
-    ctx: click.Context,
-    source_id: str,
-    geog_levels: tuple[str],
-    include: tuple[str],
-    exclude: tuple[str],
-    replace: bool,
-):
-    """
-    Create or update materialized views used for indicator maps. These can then be served as vector tiles for mapping
-    applications.
-
-    This will create/update materialized a materialized view for each geog level provided with data from the provided
-    source.
-
-    Questions can be specified by passing lists of question IDs to `--include` or `--exclude`. If no specifications
-    are made, all questions for the source will be used.
-    """
-    rat: SpaceRAT = ctx.obj["rat"]
-
-    if validate_write_setup(rat):
-        click.echo("Creating maps using data from source: " + _highlight(source_id))
-        for geog_level in geog_levels:
-            click.echo(
-                "  • at " + _highlight(geog_level) + " level... ",
-                nl=False,
-            )
-            rat.create_map_table(
-                geog_level,
-                source_id,
-                included_questions=include,
-                excluded_questions=exclude,
-                replace=replace,
-            )
-            click.echo(_bold("Done!"))
-        click.echo(_bold("Done!", fg="green"))
-
-
-@cli.command()
-@click.option(
-    "--skip-maps",
-    is_flag=True,
-    show_default=True,
-    default=False,
-    help="Skip loading maps.",
-)
-@click.pass_context
-def init(ctx: click.Context, skip_maps: bool):
-    """
-    Initialize a SpaceRAT configration.
-
-    This will...
-    1. set up the SpaceRAT database,
-    2. load your model from files, and
-    3. make any necessary modifications on the source database. (e.g. creating a `spacerat` schema, creating geographic
-       indices)
-    """
-    rat: SpaceRAT = ctx.obj["rat"]
-    rat.reinit(skip_maps=skip_maps)
-
-    click.echo(_bold("Done!", fg="green"))
+        ctx.obj["rat"] = rat
+    return ctx.obj["rat"]
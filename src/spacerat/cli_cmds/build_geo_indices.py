@@ -0,0 +1,38 @@
+from time import perf_counter
+
+import click
+
+from spacerat.cli import (
+    _done,
+    _highlight,
+    _bold,
+    abort_if_false,
+    validate_write_setup,
+    get_rat,
+)
+
+
+@click.command()
+@click.argument("geog_levels", nargs=-1)
+@click.option(
+    "--yes",
+    is_flag=True,
+    callback=abort_if_false,
+    expose_value=False,
+    prompt="Drop and rebuild geographic index tables?",
+)
+@click.pass_context
+def build_geo_indices(ctx: click.Context, geog_levels: tuple[str]):
+    """Create/update materialized views for geographic indices using `Geography.query`."""
+    rat = get_rat(ctx)
+
+    if validate_write_setup(rat):
+        for geog_level in geog_levels:
+            click.echo(
+                "Creating index table for " + _highlight(geog_level) + "...  ",
+                nl=False,
+            )
+            started = perf_counter()
+            rat.create_geog_index(geog_level)
+            click.echo(_done(started))
+        click.echo(_bold("Done!", fg="green"))
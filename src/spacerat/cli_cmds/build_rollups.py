@@ -0,0 +1,44 @@
+from time import perf_counter
+
+import click
+
+from spacerat.cli import _done, _highlight, _bold, validate_write_setup, get_rat
+
+
+@click.command()
+@click.argument("source_ids", nargs=-1)
+@click.option(
+    "--refresh",
+    is_flag=True,
+    default=False,
+    help="Refresh existing rollups with current source data instead of rebuilding them.",
+)
+@click.pass_context
+def build_rollups(ctx: click.Context, source_ids: tuple[str], refresh: bool):
+    """
+    Create or refresh materialized views with source data rolled up to each source's temporal resolution.
+
+    These are used in place of the raw source tables when answering questions that don't require spatial aggregation.
+    """
+    rat = get_rat(ctx)
+
+    if validate_write_setup(rat):
+        for source_id in source_ids:
+            click.echo(
+                ("Refreshing" if refresh else "Creating")
+                + " rollup for "
+                + _highlight(source_id)
+                + "...  ",
+                nl=False,
+            )
+            started = perf_counter()
+            if refresh:
+                rat.refresh_rollup(source_id)
+            else:
+                try:
+                    rat.create_rollup(source_id)
+                except ValueError as e:
+                    click.echo(_bold("Skipped: ", fg="yellow") + str(e))
+                    continue
+            click.echo(_done(started))
+        click.echo(_bold("Done!", fg="green"))
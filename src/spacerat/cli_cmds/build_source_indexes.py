@@ -0,0 +1,24 @@
+from time import perf_counter
+
+import click
+
+from spacerat.cli import _done, _highlight, _bold, validate_write_setup, get_rat
+
+
+@click.command()
+@click.argument("source_ids", nargs=-1)
+@click.pass_context
+def build_source_indexes(ctx: click.Context, source_ids: tuple[str]):
+    """Create indexes on source tables that support the region and time filters used to answer questions."""
+    rat = get_rat(ctx)
+
+    if validate_write_setup(rat):
+        for source_id in source_ids:
+            click.echo(
+                "Creating indexes for " + _highlight(source_id) + "...  ",
+                nl=False,
+            )
+            started = perf_counter()
+            rat.create_source_indexes(source_id)
+            click.echo(_done(started))
+        click.echo(_bold("Done!", fg="green"))
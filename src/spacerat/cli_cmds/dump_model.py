@@ -0,0 +1,76 @@
+from concurrent.futures import ThreadPoolExecutor
+from os import PathLike
+from pathlib import Path
+from typing import Callable, Iterable, TYPE_CHECKING
+
+import click
+
+from spacerat.cli import _bold, write_or_print, get_rat
+
+if TYPE_CHECKING:
+    from spacerat.models import Serializable
+
+
+def _dump_all(
+    objs: Iterable["Serializable"], get_path: Callable[["Serializable"], Path | None]
+) -> None:
+    """Renders objects to yaml concurrently, writing each to its path or printing them in order."""
+
+    def dump(obj: "Serializable") -> str | None:
+        text, path = obj.as_yaml(), get_path(obj)
+        if path is None:
+            return text
+        write_or_print(text, path)
+
+    with ThreadPoolExecutor() as executor:
+        for text in executor.map(dump, objs):
+            if text is not None:
+                write_or_print(text)
+
+
+@click.command()
+@click.argument("dst", type=click.Path(exists=True), required=False)
+@click.pass_context
+def dump_model(ctx: click.Context, dst: PathLike):
+    """
+    Dump state of model to yaml files in DST.
+
+    It will add directories if needed and will overwrite conflicting files.
+    """
+    rat = get_rat(ctx)
+    dst = Path(dst) if dst else None
+
+    if dst:
+        (dst / "geographies").mkdir(exist_ok=True)
+        (dst / "sources").mkdir(exist_ok=True)
+        (dst / "questions").mkdir(exist_ok=True)
+
+    click.echo(_bold("Dumping geographies", fg="blue"))
+    _dump_all(
+        rat.get_geogs(),
+        lambda geog: dst / "geographies" / f"{geog.id}.yaml" if dst else None,
+    )
+
+    click.echo(_bold("Dumping sources", fg="blue"))
+    _dump_all(
+        rat.get_sources(),
+        lambda source: dst / "sources" / f"{source.id}.yaml" if dst else None,
+    )
+
+    click.echo(_bold("Dumping questions", fg="blue"))
+    questions = rat.get_questions()
+    if dst:
+        # one directory per source, created up front rather than once per question
+        for source_id in {question.source_id for question in questions}:
+            (dst / "questions" / source_id).mkdir(parents=True, exist_ok=True)
+
+    _dump_all(
+        questions,
+        lambda question: (
+            dst / "questions" / question.source_id / f"{question.id}.yaml"
+            if dst
+            else None
+        ),
+    )
+
+    click.echo(_bold("\nDone!", fg="green"))
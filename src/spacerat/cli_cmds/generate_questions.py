@@ -0,0 +1,25 @@
+import click
+
+from spacerat.cli import _highlight, _bold, get_rat
+
+
+@click.command()
+@click.argument("source_id")
+@click.pass_context
+def generate_questions(ctx: click.Context, source_id: str):
+    """
+    Generate set of basic Questions from a table in the source database.
+
+    This will generate one Question per column of the table and dump yaml representations of them in the model directory.
+    """
+    from spacerat.scripts.generate_questions import generate_questions_for_source
+
+    rat = get_rat(ctx)
+    source = rat.get_source(source_id)
+
+    click.echo(f"Dumping question files to {rat.model_dir}/{source.id}")
+
+    generated = generate_questions_for_source(source, rat)
+
+    click.echo(_highlight(str(generated)) + " question files generated")
+    click.echo(_bold("\nDone!", fg="green"))
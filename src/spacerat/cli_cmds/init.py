@@ -0,0 +1,28 @@
+import click
+
+from spacerat.cli import _bold, get_rat
+
+
+@click.command()
+@click.option(
+    "--skip-maps",
+    is_flag=True,
+    show_default=True,
+    default=False,
+    help="Skip loading maps.",
+)
+@click.pass_context
+def init(ctx: click.Context, skip_maps: bool):
+    """
+    Initialize a SpaceRAT configration.
+
+    This will...
+    1. set up the SpaceRAT database,
+    2. load your model from files, and
+    3. make any necessary modifications on the source database. (e.g. creating a `spacerat` schema, creating geographic
+       indices)
+    """
+    rat = get_rat(ctx)
+    rat.reinit(skip_maps=skip_maps)
+
+    click.echo(_bold("Done!", fg="green"))
@@ -0,0 +1,12 @@
+import click
+
+from spacerat.cli import _bold, get_rat
+
+
+@click.command()
+@click.pass_context
+def link_geogs(ctx: click.Context):
+    rat = get_rat(ctx)
+    click.echo("Creating geography linking tables")
+    rat.create_geog_association_tables()
+    click.echo(_bold("Done!", fg="green"))
@@ -0,0 +1,22 @@
+from os import PathLike
+
+import click
+
+from spacerat.cli import _bold, get_rat
+
+
+@click.command()
+@click.argument("src", required=False)
+@click.option("--replace", "-r", is_flag=True, default=False)
+@click.pass_context
+def load_model(ctx: click.Context, src: PathLike, replace: bool):
+    """
+    Load model data from files in `SRC` into database.
+
+    Will overwrite conflicting data.
+    """
+    from spacerat.config import init_db
+
+    rat = get_rat(ctx)
+    init_db(rat.engine, src or rat.model_dir, drop=replace)
+    click.echo(_bold("\nDone!", fg="green"))
@@ -0,0 +1,72 @@
+from time import perf_counter
+
+import click
+
+from spacerat.cli import (
+    _done,
+    _highlight,
+    _bold,
+    abort_if_false,
+    validate_write_setup,
+    get_rat,
+)
+
+
+@click.command()
+@click.argument("source_id", nargs=1)
+@click.argument("geog_levels", nargs=-1)
+@click.option("--include", "-i", help="Include a field", multiple=True)
+@click.option("--exclude", "-x", help="Exclude a field", multiple=True)
+@click.option(
+    "--replace",
+    "-r",
+    is_flag=True,
+    show_default=True,
+    default=True,
+    help="Overwrite tables if necessary.",
+)
+@click.option(
+    "--yes",
+    is_flag=True,
+    callback=abort_if_false,
+    expose_value=False,
+    prompt="Drop and rebuild map tables?",
+)
+@click.pass_context
+def populate_maps(
+    ctx: click.Context,
+    source_id: str,
+    geog_levels: tuple[str],
+    include: tuple[str],
+    exclude: tuple[str],
+    replace: bool,
+):
+    """
+    Create or update materialized views used for indicator maps. These can then be served as vector tiles for mapping
+    applications.
+
+    This will create/update materialized a materialized view for each geog level provided with data from the provided
+    source.
+
+    Questions can be specified by passing lists of question IDs to `--include` or `--exclude`. If no specifications
+    are made, all questions for the source will be used.
+    """
+    rat = get_rat(ctx)
+
+    if validate_write_setup(rat):
+        click.echo("Creating maps using data from source: " + _highlight(source_id))
+        for geog_level in geog_levels:
+            click.echo(
+                "  • at " + _highlight(geog_level) + " level... ",
+                nl=False,
+            )
+            started = perf_counter()
+            rat.create_map_table(
+                geog_level,
+                source_id,
+                included_questions=include,
+                excluded_questions=exclude,
+                replace=replace,
+            )
+            click.echo(_done(started))
+        click.echo(_bold("Done!", fg="green"))
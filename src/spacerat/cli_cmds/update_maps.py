@@ -0,0 +1,39 @@
+import click
+
+from spacerat.cli import (
+    _highlight,
+    _bold,
+    abort_if_false,
+    validate_write_setup,
+    get_rat,
+)
+
+
+@click.command()
+@click.argument("map_id", nargs=1)
+@click.option(
+    "--replace",
+    "-r",
+    is_flag=True,
+    show_default=True,
+    default=True,
+    help="Overwrite tables if necessary.",
+)
+@click.option(
+    "--yes",
+    is_flag=True,
+    callback=abort_if_false,
+    expose_value=False,
+    prompt="Drop and rebuild map tables?",
+)
+@click.pass_context
+def update_maps(ctx: click.Context, map_id: str, replace):
+    """Loads/updates maps for a MapConfig"""
+    rat = get_rat(ctx)
+    map_config = rat.get_map_config(map_id)
+    click.echo("Creating maps using config: " + _highlight(map_config.name))
+
+    if validate_write_setup(rat):
+        rat.update_maps(map_id, replace=replace)
+
+    click.echo(_bold("Done!", fg="green"))
@@ -1,10 +1,17 @@
+import datetime
+import hashlib
+import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from os import PathLike
 from pathlib import Path
-from typing import Type
+from typing import Type, Iterator
 
 import yaml
-from sqlalchemy import select, Engine
+from sqlalchemy import select, delete, insert, Engine, create_engine, event
+from sqlalchemy.exc import DBAPIError
 from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
 
 from spacerat.models import (
     Base,
@@ -15,25 +22,74 @@ from spacerat.models import (
     GeographyFilter,
     MapConfig,
     MapConfigVariant,
+    ModelFile,
+    SpaceRATMeta,
+    parse_spatial_domain,
+    validate_sql_fragment,
 )
 
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
+
 _engine: Engine
 
+# model files are small and independent, so they're read concurrently
+MODEL_READ_WORKERS = min(32, (os.cpu_count() or 1) * 4)
 
-def _load_source(**kwargs) -> Source:
-    spatial_domain = kwargs["spatial_domain"]
-    del kwargs["spatial_domain"]
-    if type(spatial_domain) is str:
-        spatial_domain_str = spatial_domain
+# bounded LRU of compiled model statements, shared by every session on an engine
+MODEL_QUERY_CACHE_SIZE = 256
+
+# the model db is rebuilt from yaml on init, so durability is traded for startup speed
+_SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=MEMORY",
+    "PRAGMA synchronous=OFF",
+    "PRAGMA temp_store=MEMORY",
+)
+
+
+def create_model_engine(db_url: str, echo: bool = False) -> Engine:
+    """Creates the engine for the model DB, sharing one connection for in-memory sqlite."""
+    options = {"echo": echo, "query_cache_size": MODEL_QUERY_CACHE_SIZE}
+    if not db_url.startswith("sqlite"):
+        return create_engine(db_url, **options)
+
+    if db_url in ("sqlite://", "sqlite:///:memory:"):
+        engine = create_engine(
+            db_url,
+            connect_args={"check_same_thread": False},
+            poolclass=StaticPool,
+            **options,
+        )
     else:
-        spatial_domain_str = ",".join(spatial_domain)
+        engine = create_engine(db_url, **options)
+
+    @event.listens_for(engine, "connect")
+    def _set_pragmas(dbapi_connection, _):
+        cursor = dbapi_connection.cursor()
+        for pragma in _SQLITE_PRAGMAS:
+            cursor.execute(pragma)
+        cursor.close()
+
+    return engine
+
+
+def _load_source(**kwargs) -> Source:
+    kwargs["spatial_domain"] = parse_spatial_domain(kwargs["spatial_domain"])
 
     if "region_select" not in kwargs:
         if kwargs["spatial_resolution"] != "point":
             raise ValueError("region_select is required")
 
+    # fragments are spliced into every query against the source, so they're checked up front
+    if '"' in kwargs["table"]:
+        raise ValueError(f"Invalid table name {kwargs['table']!r}")
+    validate_sql_fragment(kwargs.get("region_select"), "region_select")
+    validate_sql_fragment(kwargs["time_select"], "time_select")
+
     # todo: handle variants and filters
-    return Source(**kwargs, spatial_domain_str=spatial_domain_str)
+    return Source(**kwargs)
 
 
 def _load_geog(**kwargs) -> Geography:
@@ -47,16 +103,22 @@ def _load_geog(**kwargs) -> Geography:
 
     geog = Geography(**kwargs, subgeographies=[])
 
-    for variant, options in variants.items():
-        geog.variants[variant] = GeographyVariant(
+    geog.variants = [
+        GeographyVariant(
             id=variant,
             name=options["name"],
             description=options.get("description"),
-            where_clause=options["where_clause"],
+            where_clause=validate_sql_fragment(
+                options["where_clause"], f"{variant} variant"
+            ),
         )
+        for variant, options in variants.items()
+    ]
 
     for _filter, clause in filters.items():
-        geog.filters[_filter] = GeographyFilter(id=_filter, where_clause=clause)
+        geog.filters[_filter] = GeographyFilter(
+            id=_filter, where_clause=validate_sql_fragment(clause, f"{_filter} filter")
+        )
 
     return geog
 
@@ -64,15 +126,21 @@ def _load_geog(**kwargs) -> Geography:
 def _load_question(**kwargs) -> Question:
     source_id = kwargs["source"]
     del kwargs["source"]
-    question = Question(**kwargs)
-    # connect sources
-    with Session(_engine) as session:
-        question.source_id = source_id
-        session.commit()
-    return question
+    validate_sql_fragment(kwargs["value_select"], "value_select")
+    # connect source by key, the relationship is resolved on insert
+    return Question(**kwargs, source_id=source_id)
+
 
+def _get_id_map(session: Session, model: Type[Base]) -> dict:
+    """Fetches all objects of a model in one query, keyed by their ID."""
+    return {obj.id: obj for obj in session.scalars(select(model)).unique().all()}
 
-def _load_map(**kwargs) -> MapConfig:
+
+def _load_map(
+    geogs_by_id: dict[str, Geography],
+    questions_by_id: dict[str, Question],
+    **kwargs,
+) -> MapConfig:
     source_id = kwargs["source"]
     raw_geographies = kwargs["geographies"]
     raw_questions = kwargs["questions"]
@@ -83,122 +151,195 @@ def _load_map(**kwargs) -> MapConfig:
     if "variants" in kwargs:
         del kwargs["variants"]
 
-    with Session(_engine) as session:
-        map_config = MapConfig(**kwargs)
-        # link source
-        source = session.scalars(select(Source).where(Source.id == source_id)).first()
-        map_config.source = source
-        session.add(map_config)
-        # link geographies
-        for geog_level in raw_geographies:
-            geog = session.scalars(
-                select(Geography).where(Geography.id == geog_level)
-            ).first()
-            map_config.geographies.append(geog)
-
-        # link questions
-        for qid in raw_questions:
-            question = session.scalars(
-                select(Question).where(Question.id == qid)
-            ).first()
-            if question:
-                map_config.questions.append(question)
-
-        # link variants
-        for variant_id, variant_config in raw_variants.items():
-            map_variant = MapConfigVariant(
-                id=f"{map_config.id}-{variant_id}",
-                map_config=map_config,
-                variant_id=variant_id,
-            )
-            session.add(map_variant)
-
-            if variant_config is not None:
-                # link specific questions for variant, if any
-                for qid in variant_config.get("questions", []):
-                    question = session.scalars(
-                        select(Question).where(Question.id == qid)
-                    ).first()
-                    map_variant.questions.append(question)
-        session.commit()
-    return map_config
-
-
-def _init_model(config_dir: PathLike, loader) -> None:
-    """Loads all model object files in a directory."""
-    config_dir = Path(config_dir)
-
-    files = config_dir.glob("**/*.yaml")
-
-    with Session(_engine) as session:
-        objs = []
-        for filename in files:
-            with open(config_dir / filename) as f:
-                config = yaml.safe_load(f)
-                objs.append(loader(**config))
-
-        session.add_all(objs)
-        session.commit()
+    # connect source by key, like questions, so the transient map isn't added to the source's maps
+    map_config = MapConfig(**kwargs, source_id=source_id)
+    # link geographies
+    for geog_level in raw_geographies:
+        map_config.geographies.append(geogs_by_id.get(geog_level))
+
+    # link questions
+    for qid in raw_questions:
+        question = questions_by_id.get(qid)
+        if question:
+            map_config.questions.append(question)
+
+    # link variants
+    for variant_id, variant_config in raw_variants.items():
+        # added along with the map config
+        map_variant = MapConfigVariant(
+            id=f"{map_config.id}-{variant_id}",
+            map_config=map_config,
+            variant_id=variant_id,
+        )
 
+        if variant_config is not None:
+            # link specific questions for variant, if any
+            for qid in variant_config.get("questions", []):
+                map_variant.questions.append(questions_by_id.get(qid))
+    return map_config
 
-def _has_new_files(config_dir: Path, model: Type[Base]) -> bool:
-    """Checks for new files in model directories"""
-    with Session(_engine) as session:
-        objs = session.scalars(select(model)).unique().all()
 
-    return len(list(config_dir.glob("**/*.yaml"))) > len(objs)
+def _read_yaml(path: Path) -> dict:
+    with open(path) as f:
+        return yaml.load(f, Loader=SafeLoader)
+
+
+def _read_configs(files: list[tuple[Path, ModelFile]]) -> list[dict]:
+    """Parses model object files."""
+    with ThreadPoolExecutor(max_workers=MODEL_READ_WORKERS) as executor:
+        return list(executor.map(_read_yaml, (path for path, _ in files)))
+
+
+def _scan_yaml_files(config_dir: Path) -> Iterator[tuple[Path, os.stat_result]]:
+    """Recursively yields the yaml files in a directory along with their stats."""
+    try:
+        entries = os.scandir(config_dir)
+    except FileNotFoundError:
+        return
+    with entries:
+        for entry in entries:
+            if entry.is_dir():
+                yield from _scan_yaml_files(Path(entry.path))
+            elif entry.name.endswith(".yaml") and entry.is_file():
+                yield Path(entry.path), entry.stat()
+
+
+def _get_changed_files(
+    config_dir: Path, model_dir: Path, file_states: dict[str, ModelFile]
+) -> list[tuple[Path, ModelFile]]:
+    """Finds model files in a directory that are new or changed since they were last loaded, with their current state."""
+    changed = []
+    for path, stat in _scan_yaml_files(config_dir):
+        key = path.relative_to(model_dir).as_posix()
+        state = file_states.get(key)
+        if state is None:
+            state = ModelFile(path=key)
+        elif (state.mtime_ns, state.size) == (stat.st_mtime_ns, stat.st_size):
+            continue
+        state.mtime_ns, state.size = stat.st_mtime_ns, stat.st_size
+        changed.append((path, state))
+    return changed
+
+
+def _init_model(
+    session: Session,
+    model: Type[Base],
+    changed_files: list[tuple[Path, ModelFile]],
+    loader,
+) -> list[dict]:
+    """Loads changed model object files, replacing objects loaded from earlier versions. Returns the parsed configs."""
+    configs = _read_configs(changed_files)
+
+    existing_ids = set(session.scalars(select(model.id)))
+    for config in configs:
+        obj = loader(**config)
+        if obj.id in existing_ids:
+            session.merge(obj)
+        else:
+            session.add(obj)
+
+    # recorded in the same transaction, so a failed load is retried next time
+    session.add_all(state for _, state in changed_files)
+    # flush so later loaders in the same transaction can link to these objects
+    session.flush()
+
+    return configs
+
+
+def _get_schema_version() -> str:
+    """Fingerprint of the model DB's table definitions."""
+    key = hashlib.sha1()
+    for table in Base.metadata.sorted_tables:
+        key.update(repr(table).encode())
+    return key.hexdigest()
+
+
+def _has_schema_version(engine: Engine, schema_version: str) -> bool:
+    try:
+        with engine.connect() as conn:
+            return conn.scalar(select(SpaceRATMeta.schema_version)) == schema_version
+    except DBAPIError:
+        # no tables yet
+        return False
+
+
+def _create_tables(engine: Engine, drop: bool = False) -> None:
+    """Creates the model DB's tables, unless they were already created with the current schema."""
+    schema_version = _get_schema_version()
+    if not drop and _has_schema_version(engine, schema_version):
+        # `create_all` checks for each table first, which is a round trip per table
+        return
+
+    # the tables only hold what's loaded from the yaml model, so when they were created with a different (or unknown)
+    # schema they're rebuilt from scratch rather than migrated. `create_all` wouldn't alter existing tables
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    with engine.begin() as conn:
+        conn.execute(delete(SpaceRATMeta))
+        conn.execute(
+            insert(SpaceRATMeta).values(
+                schema_version=schema_version,
+                created_at=datetime.datetime.now(datetime.timezone.utc),
+            )
+        )
 
 
 def init_db(engine: Engine, model_dir: PathLike, drop=False, skip_maps=False) -> Engine:
     global _engine
     _engine = engine
-    model_dir = Path(model_dir)
+    # absolute, so file paths are stable keys for the parsed config snapshots
+    model_dir = Path(model_dir).absolute()
     sources_dir = model_dir / "sources"
     geogs_dir = model_dir / "geographies"
     questions_dir = model_dir / "questions"
     maps_dir = model_dir / "maps"
 
     # (re)Build database
-    if drop:
-        Base.metadata.drop_all(_engine)
-    Base.metadata.create_all(_engine)
-
-    # load Sources
-    if _has_new_files(sources_dir, Source):
-        print("Loading new Sources...")
-        _init_model(sources_dir, _load_source)
-
-    # load Geographies
-    if _has_new_files(geogs_dir, Geography):
-        print("Loading new Geographies...")
-        _init_model(geogs_dir, _load_geog)
-
-        # link geogs
-        for filename in geogs_dir.glob("*.yaml"):
-            with open(geogs_dir / filename) as f:
-                config = yaml.safe_load(f)
-
-                with Session(_engine) as session:
-                    geog = session.scalars(
-                        select(Geography).where(Geography.id == config["id"])
-                    ).first()
-                    if config["subgeographies"]:
-                        for subgeog_id in config["subgeographies"]:
-                            subgeog = session.scalars(
-                                select(Geography).where(Geography.id == subgeog_id)
-                            ).first()
-
-                            geog.subgeographies.append(subgeog)
-                        session.commit()
-
-    # load Questions
-    if _has_new_files(questions_dir, Question):
-        print("Loading new Questions...")
-        _init_model(questions_dir, _load_question)
-
-    # load Maps
-    if not skip_maps and _has_new_files(maps_dir, MapConfig):
-        print("Loading new Maps...")
-        _init_model(maps_dir, _load_map)
+    _create_tables(_engine, drop=drop)
+
+    # load the whole model in a single transaction
+    with Session(_engine) as session:
+        # only files that are new or changed since they were last loaded into this db are loaded
+        file_states = {
+            state.path: state for state in session.scalars(select(ModelFile))
+        }
+
+        # load Sources
+        if changed := _get_changed_files(sources_dir, model_dir, file_states):
+            print("Loading new Sources...")
+            _init_model(session, Source, changed, _load_source)
+
+        # load Geographies
+        if changed := _get_changed_files(geogs_dir, model_dir, file_states):
+            print("Loading new Geographies...")
+            geog_configs = _init_model(session, Geography, changed, _load_geog)
+
+            # link geogs
+            geogs = _get_id_map(session, Geography)
+            for config in geog_configs:
+                geogs[config["id"]].subgeographies = [
+                    geogs[subgeog_id] for subgeog_id in config["subgeographies"] or []
+                ]
+            session.flush()
+
+        # load Questions
+        if changed := _get_changed_files(questions_dir, model_dir, file_states):
+            print("Loading new Questions...")
+            _init_model(session, Question, changed, _load_question)
+
+        # load Maps
+        if not skip_maps and (
+            changed := _get_changed_files(maps_dir, model_dir, file_states)
+        ):
+            print("Loading new Maps...")
+            # the objects maps link to are fetched once for all map files
+            load_map = partial(
+                _load_map,
+                _get_id_map(session, Geography),
+                _get_id_map(session, Question),
+            )
+            _init_model(session, MapConfig, changed, load_map)
+
+        session.commit()
 
     return _engine
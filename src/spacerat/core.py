@@ -1,24 +1,41 @@
 from __future__ import annotations
 
+import atexit
 import datetime
+import hashlib
+import itertools
+import logging
 import os
 import re
+import threading
+import weakref
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from functools import lru_cache, cached_property
 from os import PathLike
 from pathlib import Path
-from typing import TypeVar, Type, Sequence, Mapping, Any, Iterable, Literal
+from typing import TypeVar, Type, Sequence, Mapping, Any, Iterable, Literal, Iterator
 from urllib.parse import urlparse
 
 import jenkspy
 import psycopg2
+import psycopg2.extensions
 import psycopg2.extras
+import psycopg2.pool
 from ckanapi import RemoteCKAN
 from psycopg2.sql import Composable
 from slugify import slugify
-from sqlalchemy import Engine, create_engine, select, ColumnExpressionArgument
-from sqlalchemy.orm import Session
-
-from spacerat.config import init_db
-from spacerat.helpers import get_subgeog_clause, parse_period_name
+from sqlalchemy import Engine, select, bindparam, ColumnExpressionArgument
+from sqlalchemy.orm import Session, joinedload, selectinload, raiseload
+
+from spacerat.config import init_db, create_model_engine
+from spacerat.helpers import (
+    get_subgeog_clause,
+    get_time_bucket_clause,
+    parse_period_name,
+    sql_placeholders,
+)
 from spacerat.models import (
     Question,
     TimeAxis,
@@ -28,11 +45,29 @@ from spacerat.models import (
     RegionSet,
     QuestionSet,
     MapConfig,
+    MapConfigVariant,
 )
-from .types import AggregateResultsRow
+from .types import AggregateResultsRow, TemporalResolution
+
+logger = logging.getLogger(__name__)
 
 TIME_FIELD = "time"
 
+# maximum number of source queries run at once by `answer_question_batch`
+MAX_BATCH_WORKERS = 8
+
+# number of rows fetched per round trip when streaming results
+STREAM_ITERSIZE = 2000
+
+# numbers the server-side cursors that stream results, so concurrent streams never share a name
+_stream_ids = itertools.count(1)
+
+# number of regions above which region filters are sent as a VALUES list instead of an array
+REGION_VALUES_THRESHOLD = 64
+
+# number of assembled query templates kept per SpaceRAT instance
+QUERY_TEMPLATE_CACHE_SIZE = 256
+
 T = TypeVar("T")
 
 QuestionParam = str | Question | Sequence[str] | Sequence[Question] | QuestionSet
@@ -46,11 +81,213 @@ SPACERAT_DATASTORE_READ_URL = os.environ.get("SPACERAT_DATASTORE_URL")
 SPACERAT_DATASTORE_WRITE_URL = os.environ.get("SPACERAT_DATASTORE_WRITE_URL")
 SPACERAT_SCHEMA = os.environ.get("SPACERAT_SCHEMA", "spacerat")
 SPACERAT_MODEL_DIR = os.environ.get("SPACERAT_MODEL_DIR", Path(os.getcwd()) / "model")
+# server-side prepared statements don't survive transaction-level poolers (e.g. pgbouncer), set to "false" behind one
+SPACERAT_PREPARE_STATEMENTS = (
+    os.environ.get("SPACERAT_PREPARE_STATEMENTS", "true").lower() != "false"
+)
 
 ckan_url = os.environ.get("CKAN_URL", "https://data.wprdc.org")
 
 ckan = RemoteCKAN(ckan_url)
 
+# reads NUMERIC values as floats instead of allocating a Decimal per cell. only for values used in internal math
+# (e.g. map breaks), answers keep exact decimals since they're serialized as-is
+DECIMAL_AS_FLOAT = psycopg2.extensions.new_type(
+    psycopg2.extensions.DECIMAL.values,
+    "DECIMAL_AS_FLOAT",
+    lambda value, cur: float(value) if value is not None else None,
+)
+
+# separates the select chunks of a rollup view's columns in its comment
+_ROLLUP_COLUMN_SEPARATOR = ", "
+
+_WHITESPACE_PATTERN = re.compile(r"\s+")
+
+
+@lru_cache(maxsize=512)
+def _normalize_str_query(q: str) -> str:
+    return _WHITESPACE_PATTERN.sub(" ", q).strip()
+
+
+def _normalize_query(q: str | bytes | Composable) -> str | bytes | Composable:
+    """Collapses whitespace in query strings. Composed queries are passed through as-is."""
+    if isinstance(q, str):
+        return _normalize_str_query(q)
+    return q
+
+
+_PARAM_PATTERN = re.compile(r"%([s%])")
+
+# statements are prepared per request shape (e.g. number of regions), so each connection only keeps the most recent
+MAX_PREPARED_STATEMENTS = 64
+
+# (generation, names of prepared statements in least recently used order) for each source database connection
+_prepared_statements: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+_prepared_statements_generation = 0
+
+
+@lru_cache(maxsize=256)
+def _get_prepared_statement(q: str) -> tuple[str, str, int]:
+    """
+    Converts a query using `%s` params into a named server-side prepared statement.
+
+    :return: (statement name, PREPARE statement, number of params)
+    """
+    counter = itertools.count(1)
+    body = _PARAM_PATTERN.sub(
+        lambda match: f"${next(counter)}" if match.group(1) == "s" else "%", q
+    )
+    name = f"spacerat_{hashlib.sha1(q.encode()).hexdigest()[:16]}"
+    return name, f"PREPARE {name} AS {body}", next(counter) - 1
+
+
+def _reset_prepared_statements() -> None:
+    """Has every connection deallocate its prepared statements before running another, e.g. after views are rebuilt."""
+    global _prepared_statements_generation
+    _prepared_statements_generation += 1
+
+
+def _prepare_statement(
+    cur: psycopg2.extensions.cursor, name: str, prepare_stmt: str
+) -> None:
+    """Prepares `name` on `cur`'s connection unless it already is, deallocating the least recently used past the limit."""
+    generation, prepared = _prepared_statements.get(cur.connection, (None, None))
+    if generation != _prepared_statements_generation:
+        if prepared:
+            cur.execute("DEALLOCATE ALL")
+        prepared = OrderedDict()
+        _prepared_statements[cur.connection] = _prepared_statements_generation, prepared
+
+    if name in prepared:
+        prepared.move_to_end(name)
+        return
+
+    cur.execute(prepare_stmt)
+    prepared[name] = None
+    if len(prepared) > MAX_PREPARED_STATEMENTS:
+        evicted, _ = prepared.popitem(last=False)
+        cur.execute(f"DEALLOCATE {evicted}")
+
+
+# source database connections are pooled per DSN and shared across SpaceRAT instances in the process
+POOL_MIN_CONNECTIONS = 2
+POOL_MAX_CONNECTIONS = 20
+# seconds to wait for a connection to be returned when all of a pool's connections are in use
+POOL_TIMEOUT = 30
+
+# connection settings applied unless the DSN sets them itself, so pooled connections are identifiable
+# in pg_stat_activity and idle ones aren't silently dropped by firewalls
+CONNECTION_DEFAULTS = {
+    "application_name": "spacerat",
+    "keepalives": 1,
+    "keepalives_idle": 30,
+}
+
+
+class _BlockingConnectionPool(psycopg2.pool.ThreadedConnectionPool):
+    """Threaded connection pool that waits for a free connection when exhausted instead of raising a `PoolError`."""
+
+    def __init__(self, minconn: int, maxconn: int, *args, **kwargs):
+        self._available = threading.BoundedSemaphore(maxconn)
+        super().__init__(minconn, maxconn, *args, **kwargs)
+
+    def getconn(self, key=None):
+        if not self._available.acquire(timeout=POOL_TIMEOUT):
+            raise psycopg2.pool.PoolError(
+                f"no connection was returned to the pool within {POOL_TIMEOUT}s"
+            )
+        try:
+            return super().getconn(key)
+        except BaseException:
+            self._available.release()
+            raise
+
+    def putconn(self, conn=None, key=None, close=False):
+        try:
+            super().putconn(conn, key, close)
+        finally:
+            self._available.release()
+
+
+_pools: dict[str, _BlockingConnectionPool] = {}
+_pools_lock = threading.Lock()
+
+
+def _get_pool(dsn: str) -> _BlockingConnectionPool:
+    """Returns the connection pool for `dsn`, creating it on first use."""
+    pool = _pools.get(dsn)
+    if pool is None:
+        with _pools_lock:
+            pool = _pools.get(dsn)
+            if pool is None:
+                dsn_options = psycopg2.extensions.parse_dsn(dsn)
+                pool = _BlockingConnectionPool(
+                    POOL_MIN_CONNECTIONS,
+                    POOL_MAX_CONNECTIONS,
+                    dsn=dsn,
+                    **{
+                        option: value
+                        for option, value in CONNECTION_DEFAULTS.items()
+                        if option not in dsn_options
+                    },
+                )
+                _pools[dsn] = pool
+    return pool
+
+
+@contextmanager
+def _pooled_connection(dsn: str) -> Iterator[psycopg2.extensions.connection]:
+    """Borrows a connection from the pool for `dsn`, committing on success and rolling back on error."""
+    pool = _get_pool(dsn)
+    conn = pool.getconn()
+    try:
+        with conn:
+            yield conn
+    finally:
+        # broken connections are discarded rather than handed out again
+        pool.putconn(conn, close=bool(conn.closed))
+
+
+def close_pool() -> None:
+    """Closes all pooled source database connections. Called on shutdown."""
+    with _pools_lock:
+        for pool in _pools.values():
+            pool.closeall()
+        _pools.clear()
+
+
+atexit.register(close_pool)
+
+
+# relationships used on the answer path, loaded up front in one round trip each
+_LOADER_OPTIONS = {
+    # any other relationship access on a detached question raises rather than silently missing
+    Question: (joinedload(Question.source), raiseload("*")),
+    Source: (selectinload(Source.questions).selectinload(Question.source),),
+    MapConfig: (
+        selectinload(MapConfig.questions).joinedload(Question.source),
+        selectinload(MapConfig.variants)
+        .selectinload(MapConfigVariant.questions)
+        .joinedload(Question.source),
+    ),
+    Geography: (
+        selectinload(Geography.subgeographies).selectinload(Geography.variants),
+        selectinload(Geography.subgeographies).selectinload(Geography.filters),
+        selectinload(Geography.variants),
+        selectinload(Geography.filters),
+    ),
+}
+
+
+@lru_cache(maxsize=None)
+def _get_by_id_statement(model: Type[T]):
+    """Select for a `model` object by ID, built once per model so its compiled form is reused."""
+    return (
+        select(model)
+        .options(*_LOADER_OPTIONS.get(model, ()))
+        .where(model.id == bindparam("oid"))
+    )
+
 
 class SpaceRAT:
     engine: Engine
@@ -74,21 +311,39 @@ class SpaceRAT:
         :param source_write_url: (optional) URL used to write to source database.
         :param schema: (optional) custom schema name for spacerat objects in source db. default='spacerat'
         :param model_dir: Directory from which to load model configuration files.
-        :param debug : Enable debug mode.
+        :param debug : Enable debug mode. Logs statements sent to the model DB.
         """
-        _engine = create_engine(db_url)
+        # statement logging is costly during model loading, so it's only enabled when debugging
+        _engine = create_model_engine(db_url, echo=debug)
 
         self.source_read_url = source_read_url
         self.source_write_url = source_write_url
         self.schema = schema
         self.model_dir = model_dir
+        self.skip_init = skip_init
+
+        # full names of rollup views and the columns they were built with by source ID, None when a source has no rollup
+        self._rollups: dict[str, tuple[str, frozenset[str]] | None] = {}
+        # model objects by type and ID, filled as they're requested
+        self._objs: dict[tuple[type, str], Any] = {}
+        # query templates by shape, so repeated requests only vary in their params
+        self._get_query_template = lru_cache(maxsize=QUERY_TEMPLATE_CACHE_SIZE)(
+            self._build_query_template
+        )
 
         if skip_init:
             self.engine = _engine
         else:
             self.engine = init_db(_engine, model_dir, skip_maps=skip_maps)
 
+        # reused for all model lookups, closed after each to release its connection.
+        # sessions aren't thread-safe, so lookups are serialized when an instance is shared between threads
+        self._session = Session(self.engine, expire_on_commit=False)
+        self._session_lock = threading.Lock()
+
     def reinit(self, skip_maps: bool = False) -> None:
+        self._objs.clear()
+        self._get_query_template.cache_clear()
         self.engine = init_db(
             self.engine, model_dir=self.model_dir, skip_maps=skip_maps
         )
@@ -97,6 +352,18 @@ class SpaceRAT:
     def db_url(self) -> str:
         return str(self.engine.url)
 
+    @cached_property
+    def settings(self) -> dict[str, Any]:
+        """Connection and model settings this instance was created with."""
+        return {
+            "db_url": self.db_url,
+            "source_read_url": self.source_read_url,
+            "source_write_url": self.source_write_url,
+            "schema": self.schema,
+            "model_dir": self.model_dir,
+            "skip_init": self.skip_init,
+        }
+
     def get_map_config(self, mid: str | MapConfig) -> MapConfig:
         """Returns the MapConfig object with id `mid`"""
         if isinstance(mid, MapConfig):
@@ -132,45 +399,56 @@ class SpaceRAT:
         if isinstance(rid, Region):
             return rid
 
-        gid = rid.split(".")[0]
-        fid = rid.split(".")[1]
+        gid, _, fid = rid.partition(".")
+        if not fid:
+            raise ValueError(
+                f"Invalid region ID {rid!r}, expected `<geography>.<feature ID>`."
+            )
         geog = self.get_geog(gid)
+        if geog is None:
+            return None
+        # geographies intern the regions in use, so repeated lookups share one instance
         return geog.get_region(fid)
 
     def get_map_configs(
         self,
         *where_clause: ColumnExpressionArgument,
+        brief: bool = False,
     ) -> Sequence[MapConfig]:
-        """Returns set of Maps filtered by where clause"""
-        return self._get_objs(MapConfig, *where_clause)
+        """Returns set of Maps filtered by where clause. With `brief`, relationships aren't loaded."""
+        return self._get_objs(MapConfig, *where_clause, brief=brief)
 
     def get_sources(
         self,
         *where_clause: ColumnExpressionArgument,
+        brief: bool = False,
     ) -> Sequence[Source]:
-        """Returns set of Sources filtered by where clause"""
-        return self._get_objs(Source, *where_clause)
+        """Returns set of Sources filtered by where clause. With `brief`, relationships aren't loaded."""
+        return self._get_objs(Source, *where_clause, brief=brief)
 
     def get_questions(
         self,
         *where_clause: ColumnExpressionArgument,
+        brief: bool = False,
     ) -> Sequence[Question]:
-        """Returns set of Questions filtered by where clause"""
-        return self._get_objs(Question, *where_clause)
+        """Returns set of Questions filtered by where clause. With `brief`, relationships aren't loaded."""
+        return self._get_objs(Question, *where_clause, brief=brief)
 
     def get_geographies(
         self,
         *where_clause: ColumnExpressionArgument,
+        brief: bool = False,
     ) -> Sequence[Geography]:
         """Alias for get_geogs"""
-        return self.get_geogs(*where_clause)
+        return self.get_geogs(*where_clause, brief=brief)
 
     def get_geogs(
         self,
         *where_clause: ColumnExpressionArgument,
+        brief: bool = False,
     ) -> Sequence[Geography]:
-        """Returns set of Geographies filtered by where clause"""
-        return self._get_objs(Geography, *where_clause)
+        """Returns set of Geographies filtered by where clause. With `brief`, relationships aren't loaded."""
+        return self._get_objs(Geography, *where_clause, brief=brief)
 
     def has_question(self, qid: str) -> bool:
         try:
@@ -232,19 +510,22 @@ class SpaceRAT:
                 table_name = slugify(f"{geog.id}_to_{subgeog.id}", separator="_")
                 geog_field = slugify(geog.id, separator="_")
                 subgeog_field = slugify(subgeog.id, separator="_")
-                print(table_name)
+                logger.debug("Creating association table %s", table_name)
                 self._write_to_db(
                     f"CREATE MATERIALIZED VIEW IF NOT EXISTS {self.schema}.{table_name} AS "
                     f"SELECT geog.{geog.id_field} as {geog_field}, subgeog.{subgeog.id_field} as {subgeog_field} "
                     f"FROM {self.schema}.{geog.table} geog JOIN {self.schema}.{subgeog.table} subgeog "
                     f"ON ST_Covers(geog.geom, subgeog.centroid) "
                 )
+                # composite indexes cover lookups from either side, so joins against the table are index-only
                 self._write_to_db(
-                    f"CREATE INDEX IF NOT EXISTS {table_name}__geog__idx ON {self.schema}.{table_name} ({geog_field})"
+                    f"CREATE INDEX IF NOT EXISTS {table_name}__geog_subgeog__idx "
+                    f"ON {self.schema}.{table_name} ({geog_field}, {subgeog_field})"
                 )
 
                 self._write_to_db(
-                    f"CREATE INDEX IF NOT EXISTS {table_name}__subgeog__idx ON {self.schema}.{table_name} ({subgeog_field})"
+                    f"CREATE INDEX IF NOT EXISTS {table_name}__subgeog_geog__idx "
+                    f"ON {self.schema}.{table_name} ({subgeog_field}, {geog_field})"
                 )
 
     def update_maps(self, map_id: str, replace: bool = True):
@@ -347,6 +628,79 @@ class SpaceRAT:
             f"ON {full_view_name} (region_id)"
         )
 
+    def create_rollup(self, source_id: str, replace: bool = True):
+        """
+        Creates a materialized view in the source database with a `Source`'s data rolled up to its temporal resolution
+        for each region.
+
+        When present, it's used in place of the raw source table for questions that don't require spatial aggregation.
+
+        :param source_id: ID of `Source` to roll up.
+        :param replace:  If `True`, will replace existing view with new data.
+        """
+        source = self.get_source(source_id)
+        # computed times (e.g. `CURRENT_DATE::timestamp`) would be frozen at the time the view is built
+        if not source.time_column:
+            raise ValueError(
+                f"Source {source.id!r} can't be rolled up, its time_select is not a column."
+            )
+        view_name = self._get_rollup_view_name(source)
+        full_view_name = f'"{self.schema}"."{view_name}"'
+
+        # reduced the same way as raw data in answer queries
+        rollup_select_chunks = [q.value_agg_select_chunk for q in source.questions]
+
+        # bucketed the same way as answer queries, so they can read the time column as-is
+        time_bucket, params = get_time_bucket_clause(
+            TIME_FIELD, source.temporal_resolution
+        )
+        query = f"""
+            SELECT "region",
+                   {time_bucket} as "{TIME_FIELD}",
+                   {", ".join(rollup_select_chunks)}
+            FROM ({self._get_source_query(source, source.questions)}) raw_data
+            GROUP BY 1, 2
+        """
+
+        if replace:
+            self._write_to_db(f"DROP MATERIALIZED VIEW IF EXISTS {full_view_name}")
+
+        self._write_to_db(
+            f"CREATE MATERIALIZED VIEW {full_view_name} AS {query}", params
+        )
+        # the view's columns are recorded with it, so questions added or changed since it was built aren't read from it
+        self._write_to_db(
+            f"COMMENT ON MATERIALIZED VIEW {full_view_name} IS %s",
+            [_ROLLUP_COLUMN_SEPARATOR.join(rollup_select_chunks)],
+        )
+        # unique index is required to refresh concurrently
+        self._write_to_db(
+            f"CREATE UNIQUE INDEX IF NOT EXISTS {view_name}__region_time__idx "
+            f'ON {full_view_name} ("region", "{TIME_FIELD}")'
+        )
+        self._rollups[source.id] = full_view_name, frozenset(rollup_select_chunks)
+        # plans prepared against the previous view may no longer match it
+        _reset_prepared_statements()
+
+    def refresh_rollup(self, source_id: str, concurrently: bool = True):
+        """Refreshes a `Source`'s rollup view with current source data."""
+        source = self.get_source(source_id)
+        full_view_name = f'"{self.schema}"."{self._get_rollup_view_name(source)}"'
+        self._write_to_db(
+            f"REFRESH MATERIALIZED VIEW {'CONCURRENTLY' if concurrently else ''} {full_view_name}"
+        )
+        _reset_prepared_statements()
+
+    def create_source_indexes(self, source_id: str):
+        """Creates the `recommended_indexes` for a `Source` on its table in the source database."""
+        source = self.get_source(source_id)
+        index_prefix = slugify(source.id, separator="_")
+        for name, definition in source.recommended_indexes.items():
+            self._write_to_db(
+                f'CREATE INDEX IF NOT EXISTS "{index_prefix}__{name}__idx" '
+                f'ON "{source.table}" {definition}'
+            )
+
     def calculate_breaks(
         self,
         mapset_id: str,
@@ -366,7 +720,7 @@ class SpaceRAT:
 
         # calculate the breaks from the map data
         qry = f"""SELECT "{field}" as value FROM "{self.schema}"."{table}" """
-        data: list[float] = [row["value"] for row in self._query_db(qry)]
+        data: list[float] = self._query_db_columns(qry)["value"]
         jnb = jenkspy.JenksNaturalBreaks(n_classes)
         jnb.fit(data)
         return jnb.inner_breaks_
@@ -380,6 +734,7 @@ class SpaceRAT:
         filter: str = None,
         filter_arg: str = None,
         geom: GeomOption = None,
+        stats: frozenset[str] = None,
     ) -> tuple[str, str]:
         """
         Dry run of `answer_question`.
@@ -390,6 +745,7 @@ class SpaceRAT:
         :param variant:
         :param filter:
         :param filter_arg:
+        :param stats:
         :return: full_query, inside_query
         """
         # Parse and standardize arguments
@@ -398,21 +754,28 @@ class SpaceRAT:
         )
 
         if question_set.source.spatial_resolution == "point":
-            return self._get_direct_query(
+            query, inside_query, params = self._get_direct_query(
+                questions=question_set,
+                regions=region_set,
+                time_axis=time_axis,
+                geom=geom,
+                stats=stats,
+            )
+        else:
+            query, inside_query, params = self._get_query(
                 questions=question_set,
                 regions=region_set,
                 time_axis=time_axis,
+                variant=variant,
+                filter=filter,
+                filter_arg=filter_arg,
                 geom=geom,
+                stats=stats,
             )
 
-        return self._get_query(
-            questions=question_set,
-            regions=region_set,
-            time_axis=time_axis,
-            variant=variant,
-            filter=filter,
-            filter_arg=filter_arg,
-            geom=geom,
+        # bind params into the queries so they can be used standalone (e.g. in materialized views)
+        return self._mogrify_query(query, params), self._mogrify_query(
+            inside_query, params
         )
 
     def answer_question(
@@ -426,8 +789,10 @@ class SpaceRAT:
         aggregate: bool = True,
         query_records: bool = False,
         geom: GeomOption = None,
+        stats: frozenset[str] = None,
+        stream_records: bool = False,
         # add option that allows the set of regions provided to be spatially unioned and treated as one big single geog (e.g. hill district)
-    ) -> tuple[list[AggregateResultsRow], list]:
+    ) -> tuple[list[AggregateResultsRow], list | Iterator]:
         """
         Finds the descriptive statistics of `question` for `region` across `time_axis`.
 
@@ -453,6 +818,13 @@ class SpaceRAT:
 
         :param query_records: If True, query and return individual records at subgeog level.
 
+        :param stats: (optional) Names of the stats to calculate (e.g. `{"median"}`). Defaults to all stats available
+            for each question's datatype.
+
+        :param stream_records: If True, records are returned as an iterator that streams them from the database
+            rather than as a list. It holds a source database connection until exhausted, so close it (e.g. with
+            `contextlib.closing`) when stopping early.
+
         :return: A list results by time periods from the time axis. Statistics available in results depends on
             underlying data type.
         """
@@ -463,7 +835,7 @@ class SpaceRAT:
         )
 
         if not aggregate and not query_records:
-            print(
+            logger.warning(
                 "Neither `aggregate` nor `subgeog_records` is false, returning nothing."
             )
             return [], []
@@ -479,7 +851,98 @@ class SpaceRAT:
             aggregate=aggregate,
             query_records=query_records,
             geom=geom,
+            stats=stats,
+            stream_records=stream_records,
+        )
+
+    def answer_question_batch(
+        self,
+        question: QuestionParam,
+        regions: Sequence[RegionParam],
+        time_axis: TimeAxis = None,
+        max_workers: int = MAX_BATCH_WORKERS,
+        **kwargs,
+    ) -> list[tuple[list[AggregateResultsRow], list]]:
+        """
+        Answers `question` separately for each item in `regions`, running the source queries concurrently.
+
+        Accepts the same keyword arguments as `answer_question`.
+
+        :return: A list of `answer_question` results in the same order as `regions`.
+        """
+        if not kwargs.get("aggregate", True) and not kwargs.get("query_records", False):
+            return [([], []) for _ in regions]
+
+        # arguments are resolved serially since they go through the (single connection) model db
+        parsed_args = [
+            self._parse_args(question, region, time_axis) for region in regions
+        ]
+
+        # each worker holds a pooled connection while its query runs
+        with ThreadPoolExecutor(
+            max_workers=max(1, min(max_workers, len(regions), POOL_MAX_CONNECTIONS))
+        ) as executor:
+            futures = [
+                executor.submit(
+                    self._answer, question_set, region_set, _time_axis, **kwargs
+                )
+                for region_set, question_set, _time_axis in parsed_args
+            ]
+            return [future.result() for future in futures]
+
+    @staticmethod
+    def _get_rollup_view_name(source: Source) -> str:
+        return f"rollup__{slugify(source.id, separator='_')}"
+
+    def _get_rollup(self, questions: QuestionSet, time_axis: TimeAxis) -> str | None:
+        """
+        Returns the full name of the rollup view for `questions`' source if it can answer them across `time_axis`.
+
+        The raw source table is used instead when the view is missing one of the questions, or when the time axis cuts
+        through the periods it's rolled up to.
+        """
+        source: Source = questions.source
+        if source.id not in self._rollups:
+            self._rollups[source.id] = self._find_rollup(source)
+        rollup = self._rollups[source.id]
+        if rollup is None:
+            return None
+
+        full_view_name, columns = rollup
+        if not all(q.value_agg_select_chunk in columns for q in questions):
+            return None
+        if not time_axis.is_bucketed_by(source.temporal_resolution):
+            return None
+        return full_view_name
+
+    def _find_rollup(self, source: Source) -> tuple[str, frozenset[str]] | None:
+        """Looks up the rollup view for `source` in the source database along with the columns it was built with."""
+        if not source.time_column:
+            return None
+        full_view_name = f'"{self.schema}"."{self._get_rollup_view_name(source)}"'
+        results = self._query_db(
+            "SELECT obj_description(to_regclass(%s), 'pg_class') as columns",
+            [full_view_name],
         )
+        # views built before their columns were recorded can't be checked, so they're ignored until rebuilt
+        columns = results[0]["columns"]
+        if not columns:
+            return None
+        return full_view_name, frozenset(columns.split(_ROLLUP_COLUMN_SEPARATOR))
+
+    @staticmethod
+    def _get_source_query(source: Source, questions: Iterable[Question]) -> str:
+        """Returns a query for the raw values of `questions` by region and time from `source`'s table."""
+        raw_select_chunks = [
+            q.value_clause for q in questions
+        ]  # [ '"source_field_name" as "question_field_name"', ... ]
+
+        return f"""
+              SELECT ({source.region_select})  as "region",
+                     ({source.time_select})    as "time",
+                     {", ".join(raw_select_chunks)}
+              FROM "{source.table}"
+            """.strip()
 
     def _check_cache(self, view_name: str) -> bool:
         results = self._query_db(
@@ -493,15 +956,21 @@ class SpaceRAT:
         regions: RegionSet,
         time_axis: TimeAxis,
         geom: GeomOption = None,
-    ):
+        stats: frozenset[str] = None,
+    ) -> tuple[str, str, list]:
         source: Source = questions.source
         temporal_resolution = source.temporal_resolution
         geog: Geography = regions.geog_level
 
-        # standardize select statements
-        raw_select_chunks = [
-            q.value_clause for q in questions
-        ]  # [ '"source_field_name" as "question_field_name"', ... ]
+        # standardize select statements, collecting each question's chunks in a single pass
+        # [ '"source_field_name" as "question_field_name"', ... ]
+        raw_select_chunks = []
+        agg_select_chunks = []
+        field_names = []
+        for q in questions:
+            raw_select_chunks.append(q.value_clause)
+            agg_select_chunks.append(q.get_aggregate_select_chunk(stats))
+            field_names.append(q.field_name)
 
         source_query = f"""
               SELECT _geom                     as "geom",
@@ -510,24 +979,27 @@ class SpaceRAT:
               FROM "{source.table}"
             """.strip()
 
-        agg_select_chunks = [q.aggregate_select_chunk for q in questions]
+        # params are positional, so they're collected in the order they appear in the query
+        time_bucket, params = get_time_bucket_clause(TIME_FIELD, temporal_resolution)
 
-        # handle filtering data
-        time_filter_clause = (
-            f""" "{TIME_FIELD}" {time_axis.domain_filter} """
-            if time_axis.domain_filter
-            else ""
-        )
+        # handle filtering data - compare against raw time and region columns so indexes can be used
+        time_filter_clause, time_params = time_axis.get_filter_clause(TIME_FIELD)
+        params += time_params
 
-        has_filters = bool(time_filter_clause)
+        region_filter_clause, region_params = self._get_region_filter_clause(
+            "geog.id", regions
+        )
+        params += region_params
 
-        inner_where_clause = f"WHERE {time_filter_clause} " if has_filters else ""
+        filters = " AND ".join(
+            clause for clause in [time_filter_clause, region_filter_clause] if clause
+        )
 
-        # todo: limit to time axis
+        inner_where_clause = f"WHERE {filters} " if filters else ""
 
         inside_query = f"""
-                SELECT date_trunc('{temporal_resolution}', "time") as "{TIME_FIELD}",  
-                               {", ".join([q.field_name for q in questions])}, 
+                SELECT {time_bucket} as "{TIME_FIELD}",  
+                               {", ".join(field_names)}, 
                                geog.geom,
                                geog.id                             as "region_id"
 
@@ -551,7 +1023,7 @@ class SpaceRAT:
                {geo_join}
              """
 
-        return query, inside_query
+        return query, inside_query, params
 
     def _get_query(
         self,
@@ -562,7 +1034,8 @@ class SpaceRAT:
         filter: str = None,
         filter_arg: str = None,
         geom: GeomOption = None,
-    ) -> (str, str):
+        stats: frozenset[str] = None,
+    ) -> tuple[str, str, list]:
         """
 
         :param questions:
@@ -571,7 +1044,8 @@ class SpaceRAT:
         :param variant:
         :param filter:
         :param filter_arg:
-        :return: (full_query, inside_query)
+        :param stats:
+        :return: (full_query, inside_query, params)
         """
         source: Source = questions.source
         temporal_resolution = source.temporal_resolution
@@ -581,34 +1055,122 @@ class SpaceRAT:
 
         subgeog: Geography = regions.geog_level.get_subgeography_for_question(questions)
 
+        # there's no spatial aggregation when the geog has not been subdivided
+        spatial_agg: bool = geog.id != subgeog.id
+
+        # use the source's rollup if available when not aggregating spatially
+        rollup = None if spatial_agg else self._get_rollup(questions, time_axis)
+
+        # params are positional, so they're collected in the order they appear in the query
+        if rollup:
+            # rollups are already bucketed to the source's resolution
+            params = []
+        else:
+            _, params = get_time_bucket_clause(TIME_FIELD, temporal_resolution)
+
+        # handle filtering data - compare against raw time and region columns so indexes can be used
+        time_filter_clause, time_params = time_axis.get_filter_clause(TIME_FIELD)
+        params += time_params
+
+        variant_clause = get_subgeog_clause(subgeog.variants_by_id, variant)
+
+        filter_clause = get_subgeog_clause(subgeog.filters, filter)
+        if filter_clause and filter_arg:
+            params.append(filter_arg)
+
+        # without spatial aggregation the source's regions are the requested ones, so the mapping table isn't needed
+        # and the region filter can be applied to the source's region directly, where the planner can use its index
+        if spatial_agg:
+            region_id_field = f'regions."{slugify(geog.id, separator="_")}"'
+        else:
+            region_id_field = 'raw_data."region"'
+
+        region_filter_clause, region_params = self._get_region_filter_clause(
+            region_id_field, regions
+        )
+        params += region_params
+
+        # todo: add more sql that filters regions by spatial domain - may require another table
+        # spatial_domain_clause
+
+        filters = " AND ".join(
+            clause
+            for clause in [
+                time_filter_clause,
+                variant_clause,
+                filter_clause,
+                region_filter_clause,
+            ]
+            if clause
+        )
+
+        # everything but the params is determined by the request's shape, so the sql is only assembled once per shape
+        query, inside_query = self._get_query_template(
+            tuple(questions),
+            geog.id,
+            subgeog.id,
+            rollup,
+            time_axis.resolution,
+            region_id_field,
+            filters,
+            geom,
+            stats,
+        )
+
+        return query, inside_query, params
+
+    def _build_query_template(
+        self,
+        questions: tuple[Question, ...],
+        geog_id: str,
+        subgeog_id: str,
+        rollup: str | None,
+        resolution: TemporalResolution,
+        region_id_field: str,
+        filters: str,
+        geom: GeomOption = None,
+        stats: frozenset[str] = None,
+    ) -> tuple[str, str]:
+        """Assembles the full and inside queries for `_get_query`, leaving `%s` placeholders for its params."""
+        source: Source = self.get_source(questions[0].source_id)
+        temporal_resolution = source.temporal_resolution
+
+        geog: Geography = self.get_geog(geog_id)
+        subgeog: Geography = self.get_geog(subgeog_id)
+
         geog_field = slugify(geog.id, separator="_")
         subgeog_field = slugify(subgeog.id, separator="_")
         geo_mapping_table = f"{geog_field}_to_{subgeog_field}"
 
-        # there's no spatial aggregation when the geog has not been subdivided
         spatial_agg: bool = geog.id != subgeog.id
 
-        # get query to get raw data table
-        raw_select_chunks = [
-            q.value_clause for q in questions
-        ]  # [ '"source_field_name" as "question_field_name"', ... ]
+        # rollups already hold a single row per region and time, so at the same resolution there's nothing left
+        # to aggregate and the grouping pass can be skipped
+        pre_aggregated = bool(rollup) and temporal_resolution == resolution
 
+        # determine aggregate fields to use based on datatype these are part top-most select clause
+        # that aggregates the data in the raw source query - built alongside the field names in a single pass
+        field_name_chunks = []
+        agg_select_chunks = []
+        for q in questions:
+            field_name = q.field_name
+            field_name_chunks.append(field_name)
+            if spatial_agg:
+                agg_select_chunks.append(q.get_aggregate_select_chunk(stats))
+            elif pre_aggregated:
+                agg_select_chunks.append(field_name)
+            else:
+                agg_select_chunks.append(q.value_agg_select_chunk)
+        field_names = ", ".join(field_name_chunks)
 
-        source_query = f"""
-              SELECT ({source.region_select})  as "region",
-                     ({source.time_select})    as "time",
-                     {", ".join(raw_select_chunks)}
-              FROM "{source.table}"
+        # get query to get raw data table
+        if rollup:
+            source_query = f"""
+              SELECT "region", "{TIME_FIELD}", {field_names}
+              FROM {rollup}
             """.strip()
-
-        # determine aggregate fields to use based on datatype these are part top-most select clause
-        # that aggregates the data in the raw source query
-        if spatial_agg:
-            agg_select_chunks = [q.aggregate_select_chunk for q in questions]
         else:
-            agg_select_chunks = [
-                f"MIN({q.field_name}) as {q.field_name}" for q in questions
-            ]
+            source_query = self._get_source_query(source, questions)
 
         # query the datastore for the question, aggregating data from smaller subregions if necessary
         # returns a set of records representing the answers for the question for the region across time
@@ -616,52 +1178,48 @@ class SpaceRAT:
         group_by = "time, region_id"
         time_selection = f'"{TIME_FIELD}"'
         # handle aggregation across time
-        if not spatial_agg and temporal_resolution != time_axis.resolution:
+        if not spatial_agg and temporal_resolution != resolution:
             group_by += ", parent_region"
             time_selection = (
                 f'MIN("{TIME_FIELD}") as start_time, MAX("{TIME_FIELD}") as end_time'
             )
 
-        # handle filtering data
-        time_filter_clause = (
-            f""" "{TIME_FIELD}" {time_axis.domain_filter} """
-            if time_axis.domain_filter
-            else ""
-        )
-        variant_clause = get_subgeog_clause(subgeog.variants, variant)
-        filter_clause = get_subgeog_clause(subgeog.filters, filter)
-
-        # todo: add more sql that filters regions by spatial domain - may require another table
-        # spatial_domain_clause
+        if rollup:
+            time_bucket = f'"{TIME_FIELD}"'
+        else:
+            time_bucket, _ = get_time_bucket_clause(TIME_FIELD, temporal_resolution)
 
-        filters = " AND ".join(
-            clause
-            for clause in [time_filter_clause, variant_clause, filter_clause]
-            if clause
-        )
-        has_filters = bool(variant_clause or filter_clause or time_filter_clause)
+        if spatial_agg:
+            region_joins = f"""
+                  JOIN "{self.schema}"."{geo_mapping_table}" as regions ON raw_data.region = regions."{subgeog_field}"
+                  JOIN "{self.schema}"."{subgeog.table}" as subgeogs ON regions."{subgeog_field}" = subgeogs."{subgeog.id_field}"
+            """.strip()
+        else:
+            region_joins = f"""
+                  JOIN "{self.schema}"."{subgeog.table}" as subgeogs ON raw_data.region = subgeogs."{subgeog.id_field}"
+            """.strip()
 
-        inner_where_clause = f"WHERE {filters} " if has_filters else ""
+        inner_where_clause = f"WHERE {filters} " if filters else ""
 
         # pull extra fields from subgeog (e.g. address of parcel)
-        extra_fields_select_clause: str  = ''
+        extra_fields_select_clause: str = ""
         if subgeog.extra_fields:
-            extra_fields_select_clause += ', '
-            extra_fields_select_clause +=  ", ".join([f'subgeogs.{extra_field}' for extra_field in subgeog.extra_fields])
-
+            extra_fields_select_clause += ", "
+            extra_fields_select_clause += ", ".join(
+                [f"subgeogs.{extra_field}" for extra_field in subgeog.extra_fields]
+            )
 
         # todo: replace all with SQLAlchemy once we know what we're doin'
         # generate query that results in region, parent table and is limited to the source's spatial domain
         inside_query = f"""
-                SELECT date_trunc('{temporal_resolution}', "time") as "{TIME_FIELD}",  
-                               {", ".join([q.field_name for q in questions])}, 
+                SELECT {time_bucket} as "{TIME_FIELD}",  
+                               {field_names}, 
                                "region", 
-                               regions."{geog_field}"          as "region_id"
+                               {region_id_field}          as "region_id"
                                {extra_fields_select_clause}
                                
                 FROM ({source_query}) as raw_data 
-                  JOIN "{self.schema}"."{geo_mapping_table}" as regions ON raw_data.region = regions."{subgeog_field}"
-                  JOIN "{self.schema}"."{subgeog.table}" as subgeogs ON regions."{subgeog_field}" = subgeogs."{subgeog.id_field}"
+                  {region_joins}
                 {inner_where_clause} 
             """.strip()
 
@@ -675,17 +1233,11 @@ class SpaceRAT:
                 '{geog.id}.' || "region_id"     as region,
                 region_id
               FROM ({inside_query}) time_filtered 
-              GROUP BY {group_by}) data
+              {"" if pre_aggregated else f"GROUP BY {group_by}"}) data
           {geo_join}
         """
 
-        # generate queries with params
-        params = [filter_arg] if filter_arg else []
-
-        inside_query = self._mogrify_query(inside_query, params)
-        full_query = self._mogrify_query(query, params)
-
-        return full_query, inside_query
+        return query, inside_query
 
     def _answer(
         self,
@@ -698,18 +1250,21 @@ class SpaceRAT:
         aggregate: bool = True,
         query_records: bool = False,
         geom: GeomOption = None,
-    ) -> tuple[list[AggregateResultsRow], list]:
+        stats: frozenset[str] = None,
+        stream_records: bool = False,
+    ) -> tuple[list[AggregateResultsRow], list | Iterator]:
         """Finds result for questions across multiple regions across points in time axis."""
 
         if questions.source.spatial_resolution == "point":
-            query, inside_query = self._get_direct_query(
+            query, inside_query, params = self._get_direct_query(
                 questions=questions,
                 regions=regions,
                 time_axis=time_axis,
                 geom=geom,
+                stats=stats,
             )
         else:
-            query, inside_query = self._get_query(
+            query, inside_query, params = self._get_query(
                 questions=questions,
                 regions=regions,
                 time_axis=time_axis,
@@ -717,15 +1272,22 @@ class SpaceRAT:
                 filter=filter,
                 filter_arg=filter_arg,
                 geom=geom,
+                stats=stats,
             )
 
+        logger.debug("SQL: %s", query)
+
         # query and return requested data
         records = []
         values = []
-        if query_records:
-            records = self._query_db(inside_query)
+        if query_records and stream_records:
+            records = self._iter_query_db(inside_query, params)
+        elif query_records:
+            records = self._query_db(inside_query, params, prepare=True)
         if aggregate:
-            values: list[AggregateResultsRow] = self._query_db(query)
+            values: list[AggregateResultsRow] = self._query_db(
+                query, params, prepare=True
+            )
 
         return values, records
 
@@ -752,14 +1314,9 @@ class SpaceRAT:
                     )["records"][0]["time"]
                 )
                 start = end - parse_period_name(source.temporal_resolution)
-                time_axis = TimeAxis(
-                    resolution,
-                    domain=(start, end),
-                )
+                time_axis = TimeAxis.from_range(resolution, start, end)
             else:
-                time_axis = TimeAxis(
-                    question_set.source.temporal_resolution, domain="current"
-                )
+                time_axis = TimeAxis.from_name(resolution, "current")
 
         return region_set, question_set, time_axis
 
@@ -779,16 +1336,30 @@ class SpaceRAT:
             if "." in args:
                 return RegionSet(self.get_region(args))
             else:
-                print(args)
                 geog_level = self.get_geography(args)
                 return RegionSet("ALL", geog_level=geog_level)
 
         if isinstance(args, Sequence):
             if type(args[0]) == str:
-                return RegionSet(*[self.get_region(arg) for arg in args])
+                return self._parse_region_ids(args)
 
             return RegionSet(*args)
 
+    def _parse_region_ids(self, rids: Sequence[str]) -> "RegionSet":
+        """Generate RegionSet from region IDs (e.g. `neighborhood.shadyside`), looking up their geography once."""
+        gids, fids = set(), []
+        for rid in rids:
+            gid, _, fid = rid.partition(".")
+            gids.add(gid)
+            fids.append(fid)
+        if len(gids) > 1:
+            raise ValueError(
+                "Regions in a RegionSet must all be of the same Geography."
+            )
+
+        geog = self.get_geog(gids.pop())
+        return RegionSet.from_feature_ids(geog, fids)
+
     def _parse_question_arg(
         self,
         args: "QuestionParam",
@@ -796,9 +1367,6 @@ class SpaceRAT:
     ) -> "QuestionSet":
         """Generate QuestionSet by funneling all possible argument formats."""
 
-        def _parse(_args: str | Question) -> "Question":
-            return self.get_question(_args)
-
         # if a questionset is passed, check it
         if isinstance(args, QuestionSet):
             if not args.directly_describes(geog):
@@ -809,26 +1377,58 @@ class SpaceRAT:
         # first, turn args into a list of questions
         questions: list["Question"]
         if isinstance(args, Sequence) and not isinstance(args, str):
-            questions = [_parse(q) for q in args]
+            found = self._get_objs_by_ids(
+                Question, [arg for arg in args if isinstance(arg, str)]
+            )
+            questions = [
+                found.get(arg) if isinstance(arg, str) else arg for arg in args
+            ]
         else:
-            questions = [_parse(args)]
+            questions = [self.get_question(args)]
 
-        # test for shared source
-        first_source, subgeog = questions[0].get_source_and_subgeog(geog)
-        if not first_source:
+        # test for shared source in a single pass
+        source_ids = {question.source_id for question in questions}
+        if None in source_ids:
             raise ValueError("No Source found for this Question at this Geography.")
-
-        for question in questions[1:]:
-            test_source = question.source
-            if not test_source:
-                raise ValueError("No source found for this Question at this Geography.")
-            if test_source != first_source:
-                raise ValueError(
-                    "The Questions provided don't use the same Source for this geography."
-                )
+        if len(source_ids) > 1:
+            raise ValueError(
+                "The Questions provided don't use the same Source for this geography."
+            )
 
         # build a questionset and return it
-        return QuestionSet(first_source, *questions)
+        return QuestionSet(questions[0].source, *questions)
+
+    def _get_objs_by_ids(self, model: Type[T], oids: Iterable[str]) -> dict[str, T]:
+        """Returns `model` objects by ID, loading any that aren't cached in a single query."""
+        oids = set(oids)
+        missing = [oid for oid in oids if (model, oid) not in self._objs]
+        if missing:
+            for obj in self._get_objs(model, model.id.in_(missing)) or []:
+                self._objs[(model, obj.id)] = obj
+
+        return {
+            oid: self._objs[(model, oid)] for oid in oids if (model, oid) in self._objs
+        }
+
+    @staticmethod
+    def _get_region_filter_clause(
+        field: str, regions: RegionSet
+    ) -> tuple[str | None, list]:
+        """
+        Returns a predicate limiting `field` to the regions in `regions` along with its parameters.
+
+        Small sets are passed as a single array parameter. Larger ones are expanded into a VALUES list so the planner
+        can estimate their cardinality and hash join against them.
+        """
+        if regions.feature_ids == "ALL":
+            return None, []
+
+        feature_ids = list(regions.feature_ids)
+        if len(feature_ids) > REGION_VALUES_THRESHOLD:
+            values = sql_placeholders(len(feature_ids), "(%s)")
+            return f"{field} IN (VALUES {values})", feature_ids
+
+        return f"{field} = ANY(%s)", [feature_ids]
 
     def _get_geog_select_and_join(
         self, geog, geom: GeomOption = None
@@ -846,61 +1446,140 @@ class SpaceRAT:
         return geo_select, geo_join
 
     def _get_obj(self, model: Type[T], oid: str) -> T | None:
-        try:
-            with Session(self.engine) as session:
-                result = session.scalars(
-                    select(model).where(model.id.like(oid))
+        # the model doesn't change after init, so each object is only looked up once
+        key = (model, oid)
+        if key in self._objs:
+            return self._objs[key]
+
+        with self._session_lock:
+            try:
+                result = self._session.scalars(
+                    _get_by_id_statement(model), {"oid": oid}
                 ).first()
-                session.expunge_all()
-                return result
-        except Exception as e:
-            print(e)
-            return None
+            except Exception:
+                logger.exception("Failed to load %s %r", model.__name__, oid)
+                return None
+            finally:
+                # detaches loaded objects, as they're used outside the session
+                self._session.close()
+
+        if result is not None:
+            self._objs[key] = result
+        return result
 
     def _get_objs(
         self,
         model: Type[T],
         *where_clause: ColumnExpressionArgument,
+        brief: bool = False,
     ) -> Sequence[T] | None:
-        try:
-            with Session(self.engine) as session:
-                if where_clause:
-                    results = (
-                        session.scalars(select(model).where(*where_clause))
-                        .unique()
-                        .all()
-                    )
-                else:
-                    results = session.scalars(select(model)).unique().all()
-                session.expunge_all()
-                return results
-        except Exception as e:
-            print(e)
-            return None
+        # brief objects only carry their own columns, e.g. for listings
+        options = (raiseload("*"),) if brief else _LOADER_OPTIONS.get(model, ())
+        stmt = select(model).options(*options)
+        if where_clause:
+            stmt = stmt.where(*where_clause)
+        with self._session_lock:
+            try:
+                return self._session.scalars(stmt).unique().all()
+            except Exception:
+                logger.exception("Failed to load %s objects", model.__name__)
+                return None
+            finally:
+                self._session.close()
 
     def _query_db(
         self,
         q: str | bytes | Composable,
         params: Sequence | Mapping[str, Any] | None = None,
+        prepare: bool = False,
     ) -> list[dict]:
-        with psycopg2.connect(self.source_read_url) as conn:
-            qry = str(re.sub(r"\s+", " ", q).strip())
+        """
+        Runs a read query against the source database.
+
+        With `prepare`, str queries with positional params are run as server-side prepared statements so Postgres
+        can reuse their plans across calls.
+        """
+        with _pooled_connection(self.source_read_url) as conn:
+            qry = _normalize_query(q)
             with conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cur:
-                cur.execute(qry, params)
+                if (
+                    prepare
+                    and SPACERAT_PREPARE_STATEMENTS
+                    and isinstance(qry, str)
+                    and not isinstance(params, Mapping)
+                ):
+                    name, prepare_stmt, n_params = _get_prepared_statement(qry)
+                    _prepare_statement(cur, name, prepare_stmt)
+                    if n_params:
+                        cur.execute(
+                            f"EXECUTE {name} ({sql_placeholders(n_params)})", params
+                        )
+                    else:
+                        cur.execute(f"EXECUTE {name}")
+                else:
+                    cur.execute(qry, params)
                 results = cur.fetchall()
-        conn.close()
         return results
 
+    def _query_db_tuples(
+        self,
+        q: str | bytes | Composable,
+        params: Sequence | Mapping[str, Any] | None = None,
+    ) -> tuple[list[str], list[tuple]]:
+        """
+        Runs a read query and returns its column names and plain tuple rows, without building a dict per row.
+
+        NUMERIC values are read as floats, so this is only for values used in internal math.
+        """
+        with _pooled_connection(self.source_read_url) as conn:
+            with conn.cursor() as cur:
+                psycopg2.extensions.register_type(DECIMAL_AS_FLOAT, cur)
+                cur.execute(_normalize_query(q), params)
+                rows = cur.fetchall()
+                names = [column.name for column in cur.description]
+        return names, rows
+
+    def _query_db_columns(
+        self,
+        q: str | bytes | Composable,
+        params: Sequence | Mapping[str, Any] | None = None,
+    ) -> dict[str, list]:
+        """Runs a read query and returns its results by column, without building a dict per row."""
+        names, rows = self._query_db_tuples(q, params)
+        columns = list(zip(*rows)) if rows else [()] * len(names)
+        return {name: list(column) for name, column in zip(names, columns)}
+
+    def _iter_query_db(
+        self,
+        q: str | bytes | Composable,
+        params: Sequence | Mapping[str, Any] | None = None,
+        itersize: int = STREAM_ITERSIZE,
+    ) -> Iterator[dict]:
+        """
+        Streams rows of a read query through a server-side cursor, fetching `itersize` rows at a time.
+
+        The cursor and its pooled connection are held until the iterator is exhausted or closed, so callers that stop
+        early must call its `close()` (e.g. through `contextlib.closing`).
+        """
+        # both are released by the with blocks when the generator finishes, or when it's closed part way through
+        with _pooled_connection(self.source_read_url) as conn:
+            with conn.cursor(
+                name=f"spacerat_stream_{next(_stream_ids)}",
+                cursor_factory=psycopg2.extras.RealDictCursor,
+            ) as cur:
+                cur.itersize = itersize
+                cur.execute(_normalize_query(q), params)
+                yield from cur
+
     def _mogrify_query(
         self,
         q: str | bytes | Composable,
         params: Sequence | Mapping[str, Any] | None = None,
     ) -> str:
-        with psycopg2.connect(self.source_read_url) as conn:
-            qry = str(re.sub(r"\s+", " ", q).strip())
+        with _pooled_connection(self.source_read_url) as conn:
+            qry = _normalize_query(q)
             with conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cur:
                 result = cur.mogrify(qry, params).decode("utf-8")
-        conn.close()
         return result
 
     def _write_to_db(
@@ -911,30 +1590,36 @@ class SpaceRAT:
         if not self.source_write_url:
             raise ValueError("source_write_url must be set")
 
-        with psycopg2.connect(self.source_write_url) as conn:
-            qry = str(re.sub(r"\s+", " ", q).strip())
+        with _pooled_connection(self.source_write_url) as conn:
+            qry = _normalize_query(q)
             with conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cur:
-                print(qry)
+                logger.debug("SQL: %s", qry)
                 cur.execute(qry, params)
-        conn.close()
 
-    def get_sql_spatial_domain(self, source: Source) -> str:
-        regions = {}
-        # group by geog
-        for domain_region in source.spatial_domain:
-            g_id, r_id = domain_region.split(".")[0:2]
-            if g_id not in regions:
-                regions[g_id] = []
-            regions[g_id].append(self.get_region(domain_region))
+    def get_sql_spatial_domain(self, source: Source) -> tuple[str, list]:
+        """Returns a SQL chunk unifying the extents of `source`'s spatial domain along with its parameters."""
+        regions = source.spatial_domain_by_geog
+
+        # load all the geographies at once
+        geogs = self._get_objs_by_ids(Geography, regions.keys())
 
         region_sets = []
-        for g_id, regions in regions.items():
-            region_sets.append(RegionSet(*regions, geog_level=self.get_geog(g_id)))
+        for g_id, r_ids in regions.items():
+            region_sets.append(RegionSet.from_feature_ids(geogs[g_id], r_ids))
 
         # creates one big chain of UNION statements unifying all the extents
-        region_union = "\nUNION\n".join([rs.extent_query for rs in region_sets])
-
-        return f"(SELECT ST_Union(the_geom) FROM ({region_union})) as region_union"
+        extent_queries = []
+        params = []
+        for region_set in region_sets:
+            extent_query, extent_params = region_set.get_extent_query()
+            extent_queries.append(extent_query)
+            params += extent_params
+        region_union = "\nUNION\n".join(extent_queries)
+
+        return (
+            f"(SELECT ST_Union(the_geom) FROM ({region_union})) as region_union",
+            params,
+        )
 
     def get_breaks(
         self,
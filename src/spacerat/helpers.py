@@ -1,6 +1,8 @@
 import os
-from datetime import timedelta
-from typing import Iterable
+from datetime import datetime, time, timedelta
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Iterable, Mapping, Sequence
 from typing import Literal, TYPE_CHECKING
 
 from slugify import slugify
@@ -13,20 +15,28 @@ if TYPE_CHECKING:
 MARTIN_URL = os.environ.get("SPACERAT_MARTIN_URL", "http://localhost:3000")
 
 
-def print_records(records: Iterable["AggregateResultsRow"]) -> None:
+def print_records(
+    records: Iterable["AggregateResultsRow"],
+    group_by: Literal["time", "region"] = "region",
+) -> None:
+    fields = None
     for record in records:
-        print_record(record)
+        # records in a result set share their keys, so the fields to print are only found once
+        if fields is None:
+            fields = tuple(k for k in record if k != group_by)
+        print_record(record, group_by, fields)
 
 
 def print_record(
     record: "AggregateResultsRow",
     group_by: Literal["time", "region"] = "region",
+    fields: Sequence[str] = None,
 ) -> None:
     print(record[group_by])
-    for k, v in record.items():
-        if k == group_by:
-            continue
-        print(f"  - {k}: {v}")
+    if fields is None:
+        fields = tuple(k for k in record if k != group_by)
+    for k in fields:
+        print(f"  - {k}: {record[k]}")
 
 
 def by_region(records: list["AggregateResultsRow"]) -> dict:
@@ -49,71 +59,145 @@ def by_region(records: list["AggregateResultsRow"]) -> dict:
     return results
 
 
+# todo: handle calendar periods more rigorously
+_PERIODS: Mapping[str, timedelta] = MappingProxyType(
+    {
+        "minute": timedelta(minutes=1),
+        "hour": timedelta(hours=1),
+        "day": timedelta(days=1),
+        "week": timedelta(days=7),
+        "month": timedelta(days=30),
+        "quarter": 3 * timedelta(days=30),
+        "year": timedelta(days=365),
+        "decade": 10 * timedelta(days=365.25),
+    }
+)
+
+
 def parse_period_name(period_name: str) -> timedelta:
     """Convert time period name to timedelta"""
-    # todo: handle calendar periods more rigorously
-    if period_name in ["minute", "hour", "day"]:
-        return timedelta(**{f"{period_name}s": 1})
-    elif period_name == "week":
-        return timedelta(days=7)
-    elif period_name == "month":
-        return timedelta(days=30)
-    elif period_name == "quarter":
-        return 3 * timedelta(days=30)
-    elif period_name == "year":
-        return timedelta(days=365)
-    elif period_name == "decade":
-        return 10 * timedelta(days=365.25)
-
-    raise ValueError("Invalid time period.")
-
-
-def get_aggregate_fields(question: "Question") -> str:
+    try:
+        return _PERIODS[period_name]
+    except KeyError:
+        raise ValueError("Invalid time period.")
+
+
+def get_time_bucket_clause(field: str, resolution: str) -> tuple[str, list]:
+    """Returns SQL truncating `field` to the start of its `resolution` period, along with its parameters."""
+    return f'date_trunc(%s, "{field}")', [resolution]
+
+
+# number of years in each multi-year period, and the year they're counted from (e.g. the 21st century began in 2001)
+_YEAR_PERIODS = {"decade": (10, 0), "century": (100, 1), "millennium": (1000, 1)}
+
+
+def is_time_bucket_start(dt: datetime, resolution: str) -> bool:
+    """Returns True if `dt` is the start of a `resolution` period, as bucketed by `get_time_bucket_clause`."""
+    if dt.tzinfo is not None:
+        # aware datetimes are bucketed in the database's timezone, which isn't known here
+        return False
+    if resolution == "microseconds":
+        return True
+    if resolution == "milliseconds":
+        return dt.microsecond % 1000 == 0
+    if resolution == "second":
+        return dt.microsecond == 0
+    if resolution == "minute":
+        return dt.second == dt.microsecond == 0
+    if resolution == "hour":
+        return dt.minute == dt.second == dt.microsecond == 0
+    if dt.time() != time():
+        return False
+    if resolution == "day":
+        return True
+    if resolution == "week":
+        return dt.weekday() == 0
+    if dt.day != 1:
+        return False
+    if resolution == "month":
+        return True
+    if resolution == "quarter":
+        return dt.month % 3 == 1
+    if dt.month != 1:
+        return False
+    if resolution == "year":
+        return True
+    years, first_year = _YEAR_PERIODS[resolution]
+    return dt.year % years == first_year
+
+
+# aggregate expressions by stat name for each datatype, in the order they're selected.
+# quartiles use identical array-form percentile_cont calls, which postgres evaluates once with a single sort
+_CONTINUOUS_FIELDS = {
+    "mean": "AVG({field_name})",
+    "mode": "MODE() WITHIN GROUP (ORDER BY {field_name})",
+    "min": "MIN({field_name})",
+    "first_quartile": "(percentile_cont(ARRAY[0.25, 0.5, 0.75]) WITHIN GROUP (ORDER BY {field_name}))[1]",
+    "median": "(percentile_cont(ARRAY[0.25, 0.5, 0.75]) WITHIN GROUP (ORDER BY {field_name}))[2]",
+    "third_quartile": "(percentile_cont(ARRAY[0.25, 0.5, 0.75]) WITHIN GROUP (ORDER BY {field_name}))[3]",
+    "max": "MAX({field_name})",
+    "stddev": "stddev_pop({field_name})",
+    "sum": "SUM({field_name})",
+    "n": "COUNT(*)",
+}
+
+_DATE_FIELDS = {
+    "min": "MIN({field_name})",
+    "max": "MAX({field_name})",
+    "n": "COUNT(*)",
+}
+
+_BOOLEAN_FIELDS = {
+    "count": "COUNT(*) FILTER (WHERE {field_name})",
+    "percent": "(COUNT(*) FILTER (WHERE {field_name})::float / COUNT(*)::float)",
+    "n": "COUNT(*)",
+}
+
+_DISCRETE_FIELDS = {
+    "mode": "MODE() WITHIN GROUP (ORDER BY {field_name})",
+    "n": "COUNT(*)",
+}
+
+
+def get_aggregate_fields(
+    question: "Question", stats: frozenset[str] | None = None
+) -> str:
     """
     Creates a string of aggregate select statements for use in top-level of main query.
     :param question:
+    :param stats: (optional) Names of stats to include, defaults to all stats available for the question's datatype.
+        The count (`n`) is always included.
     :return:
     """
-    field_name = question.field_name
-    # continuous works for continuous values
-    if question.datatype == "continuous":
-        return f"""
-          AVG({field_name})                                          as {field_name}__mean,
-          MODE() WITHIN GROUP (ORDER BY {field_name})                as {field_name}__mode,
-
-          MIN({field_name})                                          as {field_name}__min,
-          percentile_cont(0.25) WITHIN GROUP (ORDER BY {field_name}) as {field_name}__first_quartile,
-          percentile_cont(0.5) WITHIN GROUP (ORDER BY {field_name})  as {field_name}__median,
-          percentile_cont(0.75) WITHIN GROUP (ORDER BY {field_name}) as {field_name}__third_quartile,
-          MAX({field_name})                                          as {field_name}__max,
+    return _aggregate_fields(question.field_name, question.datatype, stats)
 
-          stddev_pop({field_name})                                   as {field_name}__stddev,
 
-          SUM({field_name})                                          as {field_name}__sum,
-          COUNT(*)                                                   as {field_name}__n
-        """
+@lru_cache(maxsize=256)
+def _aggregate_fields(
+    field_name: str, datatype: str, stats: frozenset[str] | None = None
+) -> str:
+    """Renders the aggregate select statements for a field. Cached as it's a pure function of its args."""
+    # continuous works for continuous values
+    if datatype == "continuous":
+        fields = _CONTINUOUS_FIELDS
 
     # date types have some limits right now
-    if question.datatype == "date":
-        return f"""
-          MIN({field_name})                                          as {field_name}__min,
-          MAX({field_name})                                          as {field_name}__max,
-          COUNT(*)                                                   as {field_name}__n
-        """
+    elif datatype == "date":
+        fields = _DATE_FIELDS
 
     # boolean datatypes are count of true
-    if question.datatype == "boolean":
-        return f"""
-          COUNT(*) FILTER (WHERE {field_name})  as {field_name}__count,
-          (COUNT(*) FILTER (WHERE {field_name})::float / COUNT(*)::float) as {field_name}__percent,
-          COUNT(*)                              as {field_name}__n
-        """
+    elif datatype == "boolean":
+        fields = _BOOLEAN_FIELDS
 
     # discrete can only do mode and count
-    return f"""
-      MODE() WITHIN GROUP (ORDER BY {field_name}) as {field_name}__mode,
-      COUNT(*)                                    as {field_name}__n
-    """
+    else:
+        fields = _DISCRETE_FIELDS
+
+    return ",\n".join(
+        f"  {expression.format(field_name=field_name)} as {field_name}__{stat}"
+        for stat, expression in fields.items()
+        if stats is None or stat in stats or stat == "n"
+    )
 
 
 def get_subgeog_clause(
@@ -127,6 +211,12 @@ def get_subgeog_clause(
     return None
 
 
+@lru_cache(maxsize=256)
+def sql_placeholders(n: int, placeholder: str = "%s") -> str:
+    """Comma separated list of `n` query placeholders. Cached as the same counts recur across requests."""
+    return ", ".join([placeholder] * n)
+
+
 def as_field_name(fid: str) -> str:
     return fid.replace("-", "_").strip()
 
@@ -1,6 +1,9 @@
 import datetime
-from dataclasses import dataclass
-from typing import Optional, Union, Literal, Iterator
+import re
+import weakref
+from dataclasses import dataclass, field
+from functools import cached_property
+from typing import Optional, Union, Literal, Iterator, Iterable, Callable
 
 import yaml
 from slugify import slugify
@@ -12,8 +15,10 @@ from sqlalchemy import (
     Table,
     Column,
     PickleType,
+    JSON,
     UniqueConstraint,
     Boolean,
+    BigInteger,
 )
 from sqlalchemy.orm import (
     DeclarativeBase,
@@ -28,12 +33,62 @@ from spacerat.helpers import (
     parse_period_name,
     as_field_name,
     get_aggregate_fields,
+    is_time_bucket_start,
     tileserver_url,
+    sql_placeholders,
 )
 from spacerat.types import TemporalResolution, DataType, TemporalDomain, ValueFormat
 
 _combine_dt = datetime.datetime.combine
 
+# a single, optionally quoted, column name
+_COLUMN_REF_PATTERN = re.compile(r'"[^"]+"|[A-Za-z_]\w*')
+
+# statement separators and comments, which have no place in a single SQL expression
+_UNSAFE_FRAGMENT_PATTERN = re.compile(r";|--|/\*")
+
+# string constants (including escape strings), quoted identifiers and dollar-quoted strings, whose contents are
+# data rather than SQL
+_QUOTED_SQL_PATTERN = re.compile(
+    r"(?<!\w)[Ee]'(?:[^'\\]|\\.|'')*'|'(?:[^']|'')*'|\"(?:[^\"]|\"\")*\"|\$(\w*)\$.*?\$\1\$",
+    re.DOTALL,
+)
+
+
+def _as_column_ref(select: Optional[str]) -> Optional[str]:
+    """Returns `select` if it's a plain column reference, otherwise None."""
+    if select and _COLUMN_REF_PATTERN.fullmatch(select.strip()):
+        return select.strip()
+    return None
+
+
+def validate_sql_fragment(fragment: Optional[str], name: str) -> Optional[str]:
+    """
+    Returns `fragment` if it can be spliced into a query as a single SQL expression, otherwise raises a ValueError.
+
+    Fragments come from model configs and are checked once, when the model is loaded.
+    """
+    if fragment is None:
+        return None
+    # only what's outside of quotes is checked
+    unquoted = _QUOTED_SQL_PATTERN.sub(" ", fragment)
+    if "'" in unquoted or '"' in unquoted:
+        raise ValueError(f"{name} has an unterminated quote: {fragment!r}")
+    if _UNSAFE_FRAGMENT_PATTERN.search(unquoted):
+        raise ValueError(
+            f"{name} must be a single SQL expression without statement separators or comments: {fragment!r}"
+        )
+    if unquoted.count("(") != unquoted.count(")"):
+        raise ValueError(f"{name} has unbalanced parentheses: {fragment!r}")
+    return fragment
+
+
+def parse_spatial_domain(spatial_domain: str | list[str]) -> list[str]:
+    """Normalizes a spatial domain config, given as a list or a comma-separated string, to a list."""
+    if isinstance(spatial_domain, str):
+        return spatial_domain.split(",")
+    return list(spatial_domain)
+
 
 # SQLAlchemy Models
 
@@ -65,7 +120,7 @@ class Serializable:
         raise NotImplementedError
 
     def as_yaml(self) -> str:
-        yaml.add_representer(_sql, sql_presenter)
+        # the `_sql` representer is registered once at import, as objects may be rendered from several threads
         return yaml.dump(
             self.as_dict(expand=False), default_flow_style=False, sort_keys=False
         )
@@ -91,10 +146,10 @@ class Question(Serializable, Base):
 
     description: Mapped[str] = mapped_column(Text(), default="")
 
-    source_id: Mapped[str] = mapped_column(ForeignKey("source.id"))
-    source: Mapped["Source"] = relationship(
-        back_populates="questions", lazy="selectin", join_depth=3
-    )
+    # indexed for loading a source's questions and maps
+    source_id: Mapped[str] = mapped_column(ForeignKey("source.id"), index=True)
+    # loaded explicitly where it's needed, see `spacerat.core._LOADER_OPTIONS`
+    source: Mapped["Source"] = relationship(back_populates="questions")
 
     datatype: Mapped[DataType] = mapped_column(String(20))
     value_select: Mapped[str] = mapped_column(Text())
@@ -108,28 +163,32 @@ class Question(Serializable, Base):
             f"Question(id={self.id!r}, name={self.name!r}, datatype={self.datatype!r})"
         )
 
-    def __eq__(self, other):
-        if isinstance(other, Question):
-            return self.id == other.id
-        return False
-
-    def __hash__(self):
-        return hash(self.id)
-
-    @property
+    @cached_property
     def field_name(self):
         return as_field_name(self.id)
 
-    @property
+    @cached_property
     def aggregate_select_chunk(self) -> str:
         return get_aggregate_fields(self)
 
+    def get_aggregate_select_chunk(self, stats: frozenset[str] | None = None) -> str:
+        """Aggregate select statements limited to `stats`, or all stats when `None`."""
+        if stats is None:
+            return self.aggregate_select_chunk
+        return get_aggregate_fields(self, stats)
+
+    @cached_property
+    def value_agg_select_chunk(self) -> str:
+        """Aggregate select statement reducing a region's values within a time period to one."""
+        agg = "BOOL_OR" if self.datatype == "boolean" else "MIN"
+        return f"{agg}({self.field_name}) as {self.field_name}"
+
     @property
     def spatial_resolution(self) -> str:
         """The geographic levels this question directly describes"""
         return self.source.spatial_resolution
 
-    @property
+    @cached_property
     def value_clause(self) -> str:
         return f"""{self.value_select} as "{self.field_name}" """
 
@@ -157,13 +216,7 @@ class Question(Serializable, Base):
 
     @staticmethod
     def from_config(**kwargs):
-        spatial_domain = kwargs["spatial_domain"]
-        del kwargs["spatial_domain"]
-        if type(spatial_domain) is str:
-            spatial_domain_str = spatial_domain
-        else:
-            spatial_domain_str = ",".join(spatial_domain)
-        return Source(**kwargs, spatial_domain_str=spatial_domain_str)
+        return Question(**kwargs)
 
     def as_dict(self, expand: bool = True, brief: bool = False) -> dict:
         result = {
@@ -188,7 +241,7 @@ class Source(Serializable, Base):
     table: Mapped[str] = mapped_column(String(120))
 
     spatial_resolution: Mapped[str] = mapped_column(String(120))
-    spatial_domain_str: Mapped[str] = mapped_column(Text())
+    spatial_domain: Mapped[list[str]] = mapped_column(JSON())
 
     temporal_resolution: Mapped[TemporalResolution] = mapped_column(String(20))
     temporal_domain_name: Mapped[Optional[TemporalDomain]] = mapped_column(
@@ -218,27 +271,57 @@ class Source(Serializable, Base):
 
     archived: Mapped[bool] = mapped_column(Boolean(), default=False)
 
-    @property
-    def spatial_domain(self) -> list[str]:
-        return self.spatial_domain_str.split(",")
-
     def __repr__(self):
         return f"Source(id={self.id!r}, name={self.name!r}, table={self.table!r})"
 
+    @cached_property
+    def spatial_domain_by_geog(self) -> dict[str, tuple[str, ...]]:
+        """Feature IDs in the spatial domain grouped by geography ID, e.g. `{"county": ("42003",)}`."""
+        domain: dict[str, list[str]] = {}
+        for domain_region in self.spatial_domain:
+            g_id, _, r_id = domain_region.partition(".")
+            domain.setdefault(g_id, []).append(r_id)
+        return {g_id: tuple(r_ids) for g_id, r_ids in domain.items()}
+
+    @property
+    def time_column(self) -> Optional[str]:
+        """The source table's time column, or None when `time_select` is computed (e.g. `CURRENT_DATE::timestamp`)."""
+        return _as_column_ref(self.time_select)
+
+    @property
+    def recommended_indexes(self) -> dict[str, str]:
+        """
+        Definitions of indexes on the source table that support the region and time filters used when answering
+        questions, by name.
+
+        Only plain column references can be indexed, computed selects (e.g. `CURRENT_DATE::timestamp`) are skipped.
+        """
+        region_column = _as_column_ref(self.region_select)
+        time_column = self.time_column
+
+        indexes = {}
+        if self.spatial_resolution == "point":
+            indexes["geom"] = "USING GIST (_geom)"
+        elif region_column and time_column:
+            indexes["region_time"] = f"({region_column}, {time_column})"
+        elif region_column:
+            indexes["region"] = f"({region_column})"
+
+        if time_column:
+            # source data is mostly appended in time order, which suits a compact BRIN index
+            indexes["time_brin"] = f"USING BRIN ({time_column})"
+
+        return indexes
+
     @staticmethod
     def from_config(config):
-        spatial_domain = config["spatial_domain"]
-        del config["spatial_domain"]
-        if type(spatial_domain) is str:
-            spatial_domain_str = spatial_domain
-        else:
-            spatial_domain_str = ",".join(spatial_domain)
-        return Source(**config, spatial_domain_str=spatial_domain_str)
-
-    def __eq__(self, other):
-        if isinstance(other, Source):
-            return self.id == other.id
-        return False
+        # the caller's config is left as-is
+        return Source(
+            **{
+                **config,
+                "spatial_domain": parse_spatial_domain(config["spatial_domain"]),
+            }
+        )
 
     def as_dict(self, **kwargs):
         return {
@@ -312,7 +395,9 @@ class Geography(Serializable, Base):
     # the field in `table` that holds region IDs for this geography
     id_field: Mapped[str] = mapped_column(String(120), default="id")
 
-    # the geographies that perfectly subdivide this geography
+    # the geographies that perfectly subdivide this geography.
+    # the hierarchy is small and already in the identity map by the time it's walked, so it's loaded immediately -
+    # selectin would re-query each level of the self-referential tree
     subgeographies: Mapped[list["Geography"]] = relationship(
         "Geography",
         secondary=geography_association,
@@ -324,16 +409,15 @@ class Geography(Serializable, Base):
 
     subgeog_ids: Mapped[list["str"]] = mapped_column(PickleType(), default=[])
 
-    variants: Mapped[dict[str, "GeographyVariant"]] = relationship(
-        collection_class=attribute_keyed_dict("id"),
+    variants: Mapped[list["GeographyVariant"]] = relationship(
         cascade="all, delete-orphan",
-        lazy="immediate",
+        lazy="selectin",
     )
 
     filters: Mapped[dict[str, "GeographyFilter"]] = relationship(
         collection_class=attribute_keyed_dict("id"),
         cascade="all, delete-orphan",
-        lazy="immediate",
+        lazy="selectin",
     )
 
     trigram_indexes: Mapped[list[str]] = mapped_column(PickleType(), default=[])
@@ -344,21 +428,46 @@ class Geography(Serializable, Base):
         return f"Geography(id={self.id!r}, name={self.name!r}, table={self.table!r})"
 
     def __eq__(self, other):
-        return self.id == other.id
+        if isinstance(other, Geography):
+            return self.id == other.id
+        return NotImplemented
+
+    @cached_property
+    def variants_by_id(self) -> dict[str, "GeographyVariant"]:
+        """Variants keyed by ID. Built on first use, after the geography is loaded."""
+        return {variant.id: variant for variant in self.variants}
+
+    @cached_property
+    def geom_query(self) -> str:
+        """SQL query for the geometry of one of this geography's regions, taking its ID as a parameter."""
+        return f"SELECT geom FROM {self.table} WHERE id = %s"
+
+    @cached_property
+    def _region_cache(self) -> "weakref.WeakValueDictionary[str, Region]":
+        return weakref.WeakValueDictionary()
 
     def get_region(self, fid: str) -> "Region":
-        return Region(geog_level=self, feature_id=fid)
+        # regions are interned while in use, so repeated lookups share one instance
+        region = self._region_cache.get(fid)
+        if region is None:
+            region = Region(geog_level=self, feature_id=fid)
+            self._region_cache[fid] = region
+        return region
+
+    @cached_property
+    def subgeographies_by_id(self) -> dict[str, "Geography"]:
+        """Subgeographies keyed by ID. Built on first use, after subgeographies are linked."""
+        return {subgeog.id: subgeog for subgeog in self.subgeographies}
 
     def get_subgeography_for_question(
         self, q: Union["Question", "QuestionSet"]
     ) -> Optional["Geography"]:
         """Find subgeography that question can be directly answered at if any"""
-        if q.directly_describes(self):
+        # a question describes exactly one geography, its source's spatial resolution
+        spatial_resolution = q.source.spatial_resolution
+        if spatial_resolution == self.id:
             return self
-        for subgeog in self.subgeographies:
-            if q.directly_describes(subgeog):
-                return subgeog
-        return None
+        return self.subgeographies_by_id.get(spatial_resolution)
 
     def as_dict(self, **kwargs):
         return {
@@ -372,6 +481,26 @@ class Geography(Serializable, Base):
         }
 
 
+class ModelFile(Base):
+    """State of a model file when it was last loaded, so unchanged files can be skipped."""
+
+    __tablename__ = "model_file"
+
+    # relative to the model directory
+    path: Mapped[str] = mapped_column(String(255), primary_key=True)
+    mtime_ns: Mapped[int] = mapped_column(BigInteger())
+    size: Mapped[int] = mapped_column(BigInteger())
+
+
+class SpaceRATMeta(Base):
+    """Version of the schema the model DB's tables were created with."""
+
+    __tablename__ = "spacerat_meta"
+
+    schema_version: Mapped[str] = mapped_column(String(64), primary_key=True)
+    created_at: Mapped[datetime.datetime] = mapped_column(DateTime(timezone=True))
+
+
 # associations for map many-to-many relations
 map_config_geography_assoc = Table(
     "map_geography_association",
@@ -412,14 +541,14 @@ class MapConfigVariant(Serializable, Base):
     )
 
     variant_id: Mapped[str] = mapped_column(ForeignKey("geography_variant.id"))
-    variant: Mapped["GeographyVariant"] = relationship(lazy="immediate")
+    variant: Mapped["GeographyVariant"] = relationship(lazy="selectin")
 
     questions: Mapped[list["Question"]] = relationship(
         "Question",
         secondary=map_config_variant_question_assoc,
         primaryjoin=id == map_config_variant_question_assoc.c.map_config_variant_id,
         secondaryjoin=Question.id == map_config_variant_question_assoc.c.question_id,
-        lazy="immediate",
+        lazy="selectin",
         join_depth=3,
     )
 
@@ -444,8 +573,9 @@ class MapConfig(Serializable, Base):
     name: Mapped[str] = mapped_column(String(120))
     description: Mapped[str] = mapped_column(Text())
 
-    source_id: Mapped[str] = mapped_column(ForeignKey("source.id"))
-    source: Mapped["Source"] = relationship(back_populates="maps", lazy="immediate")
+    # indexed for loading a source's questions and maps
+    source_id: Mapped[str] = mapped_column(ForeignKey("source.id"), index=True)
+    source: Mapped["Source"] = relationship(back_populates="maps", lazy="selectin")
 
     # the geographies that perfectly subdivide this geography
     geographies: Mapped[list["Geography"]] = relationship(
@@ -453,7 +583,7 @@ class MapConfig(Serializable, Base):
         secondary=map_config_geography_assoc,
         primaryjoin=id == map_config_geography_assoc.c.map_config_id,
         secondaryjoin=Geography.id == map_config_geography_assoc.c.geog_id,
-        lazy="immediate",
+        lazy="selectin",
         join_depth=3,
     )
 
@@ -462,14 +592,14 @@ class MapConfig(Serializable, Base):
         secondary=map_config_question_assoc,
         primaryjoin=id == map_config_question_assoc.c.map_config_id,
         secondaryjoin=Question.id == map_config_question_assoc.c.question_id,
-        lazy="immediate",
+        lazy="selectin",
         join_depth=4,
     )
 
     variants: Mapped[list["MapConfigVariant"]] = relationship(
         "MapConfigVariant",
         back_populates="map_config",
-        lazy="immediate",
+        lazy="selectin",
         join_depth=3,
     )
 
@@ -507,84 +637,110 @@ class MapConfig(Serializable, Base):
 
 # Dataclasses
 
+_MIDNIGHT = datetime.time()
+
+
+def _last_hour(now: datetime.datetime) -> tuple[datetime.datetime, datetime.datetime]:
+    end = now.replace(minute=0, second=0, microsecond=0)
+    return end - datetime.timedelta(hours=1), end
+
+
+def _last_day(now: datetime.datetime) -> tuple[datetime.datetime, datetime.datetime]:
+    end = _combine_dt(now.date(), _MIDNIGHT)
+    return end - datetime.timedelta(days=1), end
+
+
+def _last_week(now: datetime.datetime) -> tuple[datetime.datetime, datetime.datetime]:
+    # last monday
+    start = _combine_dt(
+        (now - datetime.timedelta(days=now.weekday(), weeks=1)).date(), _MIDNIGHT
+    )
+    return start, start + datetime.timedelta(weeks=1)
+
 
-@dataclass
+def _last_month(now: datetime.datetime) -> tuple[datetime.datetime, datetime.datetime]:
+    # january's previous month is december of the year before
+    year, month = divmod(now.year * 12 + now.month - 2, 12)
+    return (
+        datetime.datetime(year, month + 1, 1),
+        datetime.datetime(now.year, now.month, 1),
+    )
+
+
+def _last_year(now: datetime.datetime) -> tuple[datetime.datetime, datetime.datetime]:
+    return datetime.datetime(now.year - 1, 1, 1), datetime.datetime(now.year, 1, 1)
+
+
+# (start, end) of fixed named domains, relative to the current time
+_NAMED_DOMAINS: dict[
+    str, Callable[[datetime.datetime], tuple[datetime.datetime, datetime.datetime]]
+] = {
+    "last-hour": _last_hour,
+    "last-day": _last_day,
+    "last-week": _last_week,
+    "last-month": _last_month,
+    "last-year": _last_year,
+}
+
+
+@dataclass(slots=True)
 class TimeAxis:
     """Defines temporal resolution and domain being requested by user."""
 
     resolution: TemporalResolution
     domain: tuple[Optional[datetime.datetime], Optional[datetime.datetime]]
     domain_name: str
+    # custom ranges include their end, named domains end where the following period starts
+    end_inclusive: bool
 
     def __init__(
         self,
         resolution: TemporalResolution,
-        domain: Union[
-            TemporalDomain, tuple[datetime.datetime, datetime.datetime], tuple[str, str]
-        ],
+        domain: tuple[Optional[datetime.datetime], Optional[datetime.datetime]],
+        domain_name: str = "custom",
+        end_inclusive: bool = False,
     ):
         self.resolution = resolution
+        self.domain = domain
+        self.domain_name = domain_name
+        self.end_inclusive = end_inclusive
+
+    @classmethod
+    def from_name(
+        cls, resolution: TemporalResolution, domain: TemporalDomain
+    ) -> "TimeAxis":
+        """Builds a time axis for a named domain (e.g. `current`, `past-month`), relative to now."""
         now = datetime.datetime.now()
-        today = datetime.date.today()
-        midnight = datetime.time()
-        eod = datetime.time(hour=23, minute=59, second=59)
-
-        # convert named domains to datetime pairs
-        if isinstance(domain, str):
-            self.domain_name = domain
-            if domain == "current":
-                start = datetime.datetime.now() - parse_period_name(resolution)
-                self.domain = (start, None)
-
-            elif domain.startswith("past-"):
-                start = datetime.datetime.now() - parse_period_name(domain[5:])
-                self.domain = (start, None)
-
-            elif domain == "last-hour":
-                middle = now - datetime.timedelta(hours=1)
-                self.domain = (
-                    middle.replace(minute=0, second=0, microsecond=0),
-                    now.replace(minute=0, second=0, microsecond=0),
-                )
-
-            elif domain == "last-day":
-                self.domain = (
-                    _combine_dt(now.date().replace(day=now.day - 1), midnight),
-                    _combine_dt(now.date(), midnight),
-                )
-
-            elif domain == "last-week":
-                start = now - datetime.timedelta(
-                    days=now.weekday(), weeks=1
-                )  # last monday
-                start = _combine_dt(start.date(), midnight)
-                self.domain = (start, start + datetime.timedelta(weeks=1))
-
-            elif domain == "last-month":
-                last_month_end = today.replace(day=1) - datetime.timedelta(days=1)
-                self.domain = (
-                    _combine_dt(last_month_end.replace(day=1), midnight),
-                    _combine_dt(last_month_end, eod),
-                )
-
-            elif domain == "last-year":
-                last_year_end = today.replace(month=1, day=1) - datetime.timedelta(
-                    days=1
-                )
-                self.domain = (
-                    _combine_dt(last_year_end.replace(month=1, day=1), midnight),
-                    _combine_dt(last_year_end, eod),
-                )
+        if domain == "current":
+            start_end = (now - parse_period_name(resolution), None)
+        elif domain.startswith("past-"):
+            start_end = (now - parse_period_name(domain[5:]), None)
+        elif domain in _NAMED_DOMAINS:
+            start_end = _NAMED_DOMAINS[domain](now)
         else:
-            self.domain_name = "custom"
-            start, end = domain
-            if isinstance(start, str) and isinstance(end, str):
-                self.domain = (
-                    datetime.datetime.fromisoformat(start),
-                    datetime.datetime.fromisoformat(end),
-                )
-            else:
-                self.domain = (start, end)
+            raise ValueError(f"Unknown temporal domain {domain!r}.")
+        return cls(resolution, start_end, domain_name=domain)
+
+    @classmethod
+    def from_range(
+        cls,
+        resolution: TemporalResolution,
+        start: Optional[datetime.datetime],
+        end: Optional[datetime.datetime],
+    ) -> "TimeAxis":
+        """Builds a time axis for a custom domain between `start` and `end`, inclusive."""
+        return cls(resolution, (start, end), end_inclusive=True)
+
+    @classmethod
+    def from_iso_range(
+        cls, resolution: TemporalResolution, start: str, end: str
+    ) -> "TimeAxis":
+        """Builds a time axis for a custom domain between two ISO 8601 strings, inclusive."""
+        return cls.from_range(
+            resolution,
+            datetime.datetime.fromisoformat(start),
+            datetime.datetime.fromisoformat(end),
+        )
 
     @property
     def iso_domain(self) -> tuple[Optional[str], Optional[str]]:
@@ -602,20 +758,64 @@ class TimeAxis:
         return self.domain[1]
 
     @property
-    def domain_filter(self) -> str | None:
+    def lower_bound(self) -> Optional[datetime.datetime]:
+        """Inclusive lower bound of the domain."""
+        return self.domain[0]
+
+    @property
+    def upper_bound(self) -> Optional[datetime.datetime]:
+        """Upper bound of the domain, inclusive if `end_inclusive` is set."""
+        return self.domain[1]
+
+    @property
+    def domain_filter(self) -> tuple[str | None, list]:
+        """Predicate on a time value to be appended to a field (e.g. `BETWEEN %s AND %s`) along with its parameters."""
         if self.start and self.end:
-            return f"BETWEEN '{self.start.isoformat()}' AND '{self.end.isoformat()}'"
+            return "BETWEEN %s AND %s", [self.start, self.end]
 
         elif self.start:
-            return f"> '{self.start.isoformat()}'"
+            return "> %s", [self.start]
 
         elif self.end:
-            return f"< '{self.end.isoformat()}'"
+            return "< %s", [self.end]
         else:
-            return None
-
-
-@dataclass
+            return None, []
+
+    def is_bucketed_by(self, resolution: TemporalResolution) -> bool:
+        """
+        Returns True if the domain only covers whole `resolution` periods, so filtering on the start of each period
+        selects the same data as filtering on raw times.
+        """
+        lower, upper = self.domain
+        if lower and not is_time_bucket_start(lower, resolution):
+            return False
+        if upper and (
+            self.end_inclusive or not is_time_bucket_start(upper, resolution)
+        ):
+            return False
+        return True
+
+    def get_filter_clause(self, field: str = "time") -> tuple[str | None, list]:
+        """
+        Returns a range predicate on the raw `field` along with its parameters.
+
+        The field is compared directly, never wrapped in a function, so that indexes on it can be used.
+        """
+        lower, upper = self.domain
+        clauses, params = [], []
+        if lower:
+            clauses.append(f'"{field}" >= %s')
+            params.append(lower)
+        if upper:
+            clauses.append(f'"{field}" {"<=" if self.end_inclusive else "<"} %s')
+            params.append(upper)
+
+        if not clauses:
+            return None, []
+        return " AND ".join(clauses), params
+
+
+@dataclass(frozen=True, slots=True, weakref_slot=True)
 class Region:
     """A specific feature of a geography type.
 
@@ -624,15 +824,18 @@ class Region:
 
     geog_level: "Geography"
     feature_id: str
+    _hash: int = field(init=False, repr=False, compare=False)
 
-    @property
-    def geom_query(self) -> str:
-        return (
-            f"SELECT geom FROM {self.geog_level.table} WHERE id = '{self.feature_id}'"
-        )
+    def __post_init__(self):
+        # geographies aren't hashable themselves, but their IDs are unique
+        object.__setattr__(self, "_hash", hash((self.geog_level.id, self.feature_id)))
+
+    def get_geom_query(self) -> tuple[str, list]:
+        """Returns a SQL query for this region's geometry along with its parameters."""
+        return self.geog_level.geom_query, [self.feature_id]
 
     def __hash__(self):
-        return hash((self.geog_level, self.feature_id))
+        return self._hash
 
 
 # Collections
@@ -643,17 +846,21 @@ class QuestionSet:
 
     def __init__(self, source: "Source", *questions: "Question"):
         self.source: Source = source
-        self.questions: set["Question"] = set([])
+        # keyed by ID, as the same question may be loaded into more than one instance
+        self.questions: dict[str, "Question"] = {}
 
         for question in questions:
             self.add_question(question)
 
     def add_question(self, question: "Question") -> None:
         self._validate_question(question)
-        self.questions.add(question)
+        self.questions[question.id] = question
+        # the raw data query depends on the questions in the set
+        self.__dict__.pop("raw_data_query", None)
 
     def _validate_question(self, question: "Question") -> None:
-        if self.source.id != question.source.id:
+        # compares the foreign key, so the question's source needn't be loaded
+        if self.source.id != question.source_id:
             raise ValueError(
                 "Questions in QuestionSet must all share a common source. "
                 f"Test failed for {question}"
@@ -662,10 +869,11 @@ class QuestionSet:
     def directly_describes(self, geog: "Geography") -> bool:
         return self.source.spatial_resolution == geog.id
 
-    def get_query_at_geog(self, geog: "Geography") -> str:
-        """Returns a query for table of raw data for each question across the regions and time axis."""
+    @cached_property
+    def raw_data_query(self) -> str:
+        """Query for table of raw data for each question in the set. Built once per set of questions."""
         # the raw value select statements chunks for each of the questions in this set
-        question_select_chunks = [q.value_clause for q in self.questions]
+        question_select_chunks = [q.value_clause for q in self.questions.values()]
 
         return f"""
           SELECT ({self.source.region_select})  as "region",
@@ -674,6 +882,11 @@ class QuestionSet:
           FROM {self.source.table}
         """.strip()
 
+    def get_query_at_geog(self, geog: "Geography") -> str:
+        """Returns a query for table of raw data for each question across the regions and time axis."""
+        # sources only have data at their own spatial resolution, so the query is the same for any geog
+        return self.raw_data_query
+
     def __add__(self, other: "QuestionSet") -> "QuestionSet":
         if self.source.id != other.source.id:
             raise ValueError(
@@ -681,12 +894,12 @@ class QuestionSet:
             )
         return QuestionSet(
             self.source,
-            *self.questions,
-            *other.questions,
+            *self.questions.values(),
+            *other.questions.values(),
         )
 
     def __iter__(self) -> Iterator["Question"]:
-        return iter(self.questions)
+        return iter(self.questions.values())
 
 
 class RegionSet:
@@ -699,7 +912,8 @@ class RegionSet:
         geog_level: "Geography" = None,
     ) -> None:
         self.geog_level: Geography
-        self.feature_ids: set | Literal["ALL"]
+        # unique IDs in the order given, keeping generated queries and params stable
+        self.feature_ids: tuple[str, ...] | Literal["ALL"]
 
         if region == "ALL":
             self.feature_ids = "ALL"
@@ -709,35 +923,44 @@ class RegionSet:
                     "Special feature_id cases require a geog_level to be specified."
                 )
         else:
-            self.feature_ids = set()
+            feature_ids = []
             for _region in [region, *_regions]:
                 if not hasattr(self, "geog_level"):
                     self.geog_level = _region.geog_level
-                elif self.geog_level != _region.geog_level:
+                elif self.geog_level.id != _region.geog_level.id:
                     raise ValueError(
                         "Regions in a RegionSet must all be of the same Geography."
                     )
-                self.feature_ids.add(_region.feature_id)
+                feature_ids.append(_region.feature_id)
+            self.feature_ids = tuple(dict.fromkeys(feature_ids))
+
+    @classmethod
+    def from_feature_ids(
+        cls, geog_level: "Geography", feature_ids: Iterable[str]
+    ) -> "RegionSet":
+        """Builds a RegionSet directly from feature IDs without creating intermediate `Region`s."""
+        region_set = cls.__new__(cls)
+        region_set.geog_level = geog_level
+        region_set.feature_ids = tuple(dict.fromkeys(feature_ids))
+        return region_set
 
     def as_list(self) -> list["Region"]:
         # todo: handle "all"
-        return [Region(self.geog_level, fid) for fid in self.feature_ids]
+        return [self.geog_level.get_region(fid) for fid in self.feature_ids]
 
-    @property
-    def extent_query(self) -> str:
-        """Returns a SQL query that results in the unified 2d footprint of this region set."""
-        return (
-            f"SELECT ST_Union(geom) as the_geom "
-            f"FROM {self.geog_level.table} "
-            f"WHERE id in ({self.sql_list})"
-        )
+    def get_extent_query(self) -> tuple[str, list]:
+        """Returns a SQL query that results in the unified 2d footprint of this region set along with its parameters."""
+        query = f"SELECT ST_Union(geom) as the_geom FROM {self.geog_level.table}"
+        if self.feature_ids == "ALL":
+            return query, []
+        # ids are bound as a single array so the statement doesn't change with the number of regions
+        return f"{query} WHERE id = ANY(%s)", [list(self.feature_ids)]
 
-    @property
-    def sql_list(self) -> str:
-        """Returns a chunk of SQL for use in `IN` statements with all the IDs in this regionset."""
+    def get_sql_list(self) -> tuple[str, list]:
+        """Returns a chunk of SQL for use in `IN` statements with all the IDs in this regionset along with its parameters."""
         if self.feature_ids == "ALL":
-            return f"SELECT {self.geog_level.id_field} FROM {self.geog_level.table}"
-        return ", ".join([f"'{fid}'" for fid in self.feature_ids])
+            return f"SELECT {self.geog_level.id_field} FROM {self.geog_level.table}", []
+        return sql_placeholders(len(self.feature_ids)), list(self.feature_ids)
 
     def at_subgeog(self, subgeog: "Geography") -> "RegionSet":
         """Return a new RegionSet representing regions of smaller geographic level that fit within this region set."""
@@ -749,17 +972,16 @@ class RegionSet:
         if self.feature_ids == "ALL":
             return RegionSet("ALL", geog_level=subgeog)
 
-        return RegionSet(
-            *[Region(subgeog, fid) for fid in subregion_ids],
-            geog_level=subgeog,
-        )
+        return RegionSet.from_feature_ids(subgeog, subregion_ids)
 
     def __add__(self, other: "RegionSet") -> "RegionSet":
         if self.geog_level.id != other.geog_level.id:
             raise ValueError(
                 "Addition of RegionSets is only available for those with same geog_level."
             )
-        if self.feature_ids == "ALL" and other.feature_ids == "ALL":
+        if self.feature_ids == "ALL" or other.feature_ids == "ALL":
             return RegionSet("ALL", geog_level=self.geog_level)
 
-        return RegionSet(*self.feature_ids, *other.feature_ids)
+        return RegionSet.from_feature_ids(
+            self.geog_level, self.feature_ids + other.feature_ids
+        )
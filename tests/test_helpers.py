@@ -0,0 +1,43 @@
+import datetime
+
+import pytest
+
+from spacerat.helpers import get_time_bucket_clause, is_time_bucket_start
+
+
+@pytest.mark.parametrize(
+    "dt, resolution, expected",
+    [
+        (datetime.datetime(2023, 5, 1, 13), "hour", True),
+        (datetime.datetime(2023, 5, 1, 13, 30), "hour", False),
+        (datetime.datetime(2023, 5, 1), "day", True),
+        (datetime.datetime(2023, 5, 1, 0, 0, 1), "day", False),
+        # 2023-05-01 was a monday
+        (datetime.datetime(2023, 5, 1), "week", True),
+        (datetime.datetime(2023, 5, 2), "week", False),
+        (datetime.datetime(2023, 5, 1), "month", True),
+        (datetime.datetime(2023, 5, 2), "month", False),
+        (datetime.datetime(2023, 4, 1), "quarter", True),
+        (datetime.datetime(2023, 5, 1), "quarter", False),
+        (datetime.datetime(2023, 1, 1), "year", True),
+        (datetime.datetime(2023, 5, 1), "year", False),
+        (datetime.datetime(2020, 1, 1), "decade", True),
+        (datetime.datetime(2001, 1, 1), "century", True),
+        (datetime.datetime(2000, 1, 1), "century", False),
+        (
+            datetime.datetime(2023, 1, 1, tzinfo=datetime.timezone.utc),
+            "year",
+            False,
+        ),
+    ],
+)
+def test_is_time_bucket_start(dt, resolution, expected):
+    assert is_time_bucket_start(dt, resolution) is expected
+
+
+@pytest.mark.parametrize("resolution", ["hour", "day", "week", "month", "year"])
+def test_time_buckets_use_date_trunc(resolution):
+    assert get_time_bucket_clause("time", resolution) == (
+        'date_trunc(%s, "time")',
+        [resolution],
+    )
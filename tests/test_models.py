@@ -0,0 +1,47 @@
+import pytest
+
+from spacerat.models import validate_sql_fragment
+
+
+@pytest.mark.parametrize(
+    "fragment",
+    [
+        '"PARID"',
+        "CURRENT_DATE::timestamp",
+        'COALESCE("SALEPRICE", 0)',
+        "CASE WHEN \"CLASS\" = 'R' THEN 'residential' ELSE 'other' END",
+        # separators, comments and parentheses inside quotes are data
+        "\"DESC\" = 'a; b'",
+        "\"NOTES\" LIKE '%--%'",
+        "\"NOTES\" LIKE '/* draft */%'",
+        "\"STATUS\" = 'open ('",
+        "\"STATUS\" = 'it''s (closed'",
+        "\"STATUS\" = E'it\\'s; closed'",
+        '"weird;column(" IS NOT NULL',
+        '"STATUS" = $$a; (b$$',
+        '"STATUS" = $tag$ -- $tag$',
+    ],
+)
+def test_valid_fragments(fragment):
+    assert validate_sql_fragment(fragment, "time_select") == fragment
+
+
+@pytest.mark.parametrize(
+    "fragment",
+    [
+        '"PARID"; DROP TABLE source',
+        '"PARID" -- comment',
+        '"PARID" /* comment */',
+        'COALESCE("SALEPRICE", 0',
+        "\"STATUS\" = 'a'; DROP TABLE source",
+        '"STATUS" = \'unterminated',
+        '"STATUS = 1',
+    ],
+)
+def test_invalid_fragments(fragment):
+    with pytest.raises(ValueError):
+        validate_sql_fragment(fragment, "time_select")
+
+
+def test_none_passes_through():
+    assert validate_sql_fragment(None, "time_select") is None
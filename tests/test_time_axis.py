@@ -0,0 +1,62 @@
+import datetime
+
+from spacerat.models import TimeAxis
+
+
+def test_custom_range_includes_end():
+    start = datetime.datetime(2023, 1, 1)
+    end = datetime.datetime(2023, 12, 31)
+    clause, params = TimeAxis.from_range("month", start, end).get_filter_clause()
+    assert clause == '"time" >= %s AND "time" <= %s'
+    assert params == [start, end]
+
+
+def test_iso_range_includes_end():
+    clause, params = TimeAxis.from_iso_range(
+        "day", "2023-01-01", "2023-01-31"
+    ).get_filter_clause()
+    assert clause == '"time" >= %s AND "time" <= %s'
+    assert params == [datetime.datetime(2023, 1, 1), datetime.datetime(2023, 1, 31)]
+
+
+def test_named_domain_excludes_end():
+    time_axis = TimeAxis.from_name("month", "last-year")
+    clause, params = time_axis.get_filter_clause()
+    assert clause == '"time" >= %s AND "time" < %s'
+    assert params[1] == datetime.datetime(datetime.date.today().year, 1, 1)
+
+
+def test_aware_datetimes_are_passed_through():
+    tz = datetime.timezone(datetime.timedelta(hours=-5))
+    start = datetime.datetime(2023, 1, 1, tzinfo=tz)
+    end = datetime.datetime(2023, 2, 1, tzinfo=tz)
+    _, params = TimeAxis.from_range("day", start, end).get_filter_clause()
+    assert params == [start, end]
+    assert all(param.tzinfo is tz for param in params)
+
+
+def test_open_ended_domain():
+    start = datetime.datetime(2023, 1, 1)
+    assert TimeAxis.from_range("day", start, None).get_filter_clause() == (
+        '"time" >= %s',
+        [start],
+    )
+    assert TimeAxis.from_range("day", None, None).get_filter_clause() == (None, [])
+
+
+def test_named_domain_is_bucketed_by_its_periods():
+    time_axis = TimeAxis.from_name("month", "last-year")
+    assert time_axis.is_bucketed_by("month")
+    assert time_axis.is_bucketed_by("day")
+
+
+def test_partial_periods_are_not_bucketed():
+    time_axis = TimeAxis(
+        "day", (datetime.datetime(2023, 1, 1), datetime.datetime(2023, 1, 15))
+    )
+    assert time_axis.is_bucketed_by("day")
+    assert not time_axis.is_bucketed_by("month")
+    # an inclusive end takes in part of the period that starts at it
+    assert not TimeAxis.from_range(
+        "day", datetime.datetime(2023, 1, 1), datetime.datetime(2023, 2, 1)
+    ).is_bucketed_by("month")